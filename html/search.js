@@ -0,0 +1,56 @@
+/* ---- Full-text search over the screenplay ----
+   Queries the static index written by scripts/search_index.py
+   (html/lastrada.search.json); same normalization and matching rules as
+   search_index.search(). */
+
+function normalizeText(text) {
+  return text.toLowerCase().normalize("NFKD").replace(/\p{M}/gu, "");
+}
+
+function tokenizeText(text) {
+  return normalizeText(text).match(/[\p{L}\p{N}_]+/gu) || [];
+}
+
+async function loadSearchIndex(url = "lastrada.search.json") {
+  const response = await fetch(url);
+  if (!response.ok) throw new Error(`Cannot load search index: ${url}`);
+  return response.json();
+}
+
+/* Units containing every query term (as a phrase with phrase: true),
+   optionally restricted to a speaker and/or a kind ("p", "sp", "stage").
+   Each result is [scene, id, kind, speaker, text]. */
+function searchIndex(index, query, { speaker = null, kind = null, phrase = false } = {}) {
+  const queryTerms = tokenizeText(query);
+  if (!queryTerms.length) return [];
+
+  const postings = [];
+  for (const term of queryTerms) {
+    const entries = index.terms[term];
+    if (!entries) return [];
+    postings.push(new Map(entries.map((entry) => [entry[0], entry.slice(1)])));
+  }
+
+  // Intersect starting from the rarest term
+  const rarest = postings.reduce((a, b) => (b.size < a.size ? b : a));
+  const candidates = [...rarest.keys()]
+    .filter((unit) => postings.every((p) => p.has(unit)))
+    .sort((a, b) => a - b);
+
+  const results = [];
+  for (const unit of candidates) {
+    const row = index.units[unit];
+    if (speaker && row[3] !== speaker) continue;
+    if (kind && row[2] !== kind) continue;
+    if (phrase && postings.length > 1) {
+      let starts = new Set(postings[0].get(unit));
+      postings.slice(1).forEach((p, i) => {
+        const shifted = new Set(p.get(unit).map((pos) => pos - (i + 1)));
+        starts = new Set([...starts].filter((s) => shifted.has(s)));
+      });
+      if (!starts.size) continue;
+    }
+    results.push(row);
+  }
+  return results;
+}
@@ -0,0 +1,257 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import importlib
+import os
+from pathlib import Path
+import time
+from rdflib import Dataset
+from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+
+import jsonld_export
+import manifest
+import mapping
+import merging
+import metadata_to_rdf
+import rdf_output
+import search_index
+import site_pages
+import snapshot
+import terms
+import validate
+import xml_to_html
+import xml_to_rdf
+
+# Item scripts, each declaring a MAPPING spec (csv/<name>.csv → ttl/<name>.ttl)
+ITEMS = [
+    "book_il_primo_fellini",
+    "caricature_fellini_renzi",
+    "drawing_gelsomina_lastrada",
+    "ferrari_set_photo",
+    "guida_screenplay",
+    "la_strada_film",
+    "la_strada_soundtrack_original",
+    "photo_la_strada_fighter",
+    "photo_la_strada_woman",
+    "photo_lastrada_premiere",
+    "po_documentary",
+    "renzi_interview_2000",
+    "renzi_letter_1942",
+    "renzi_library",
+    "renzi_portrait",
+]
+
+scripts_dir = Path(__file__).resolve().parent
+ENTITIES_GRAPH = "rrr_entities"
+EDGES_GRAPH = "rrr_triples"
+
+
+def load_specs(items=ITEMS):
+    return [importlib.import_module(name).MAPPING for name in items]
+
+
+# Modules of the mapping engine: a change to any of them rebuilds every item
+ENGINE_MODULES = ["mapping.py", "dates.py", "terms.py", "rdf_output.py"]
+
+
+# Files an item graph is built from: its CSV, its spec and the mapping engine,
+# or the archival record it is built from instead (see record_files)
+def item_inputs(spec, records=None):
+    engine = [scripts_dir / module for module in ENGINE_MODULES]
+    if records and spec["name"] in records:
+        return [records[spec["name"]], scripts_dir / "metadata_to_rdf.py"] + engine
+    return [mapping.csv_file(spec), scripts_dir / (spec["name"] + ".py")] + engine
+
+
+# ARCHIVAL RECORDS
+# With records=True the MODS / VRA / EAD records of metadata/ are the source
+# of the items they describe (same local id), in place of their CSV mapping.
+# Off by default: the records name agents as literals ("Fellini, Federico")
+# where the CSV mappings link them to rrr: and authority IRIs.
+RECORDS_KEY = "options/records"
+
+
+# Item name → XML file of its record
+def record_files(names):
+    files = {}
+    for xml_file in metadata_to_rdf.collect_xml_files([metadata_to_rdf.metadata_dir]):
+        for record_id, _ in metadata_to_rdf.iter_records(xml_file):
+            if record_id in names:
+                files.setdefault(record_id, xml_file)
+    return files
+
+
+def convert_record(spec, xml_file, g):
+    for record_id, triples in metadata_to_rdf.iter_records(xml_file):
+        if record_id == spec["name"]:
+            metadata_to_rdf.record_graph(record_id, triples, g)
+    return g
+
+
+# All item graphs live as named graphs of one in-memory store; the union of
+# the named graphs is the merged dataset
+def new_dataset():
+    return mapping.bind_namespaces(Dataset(default_union=True))
+
+
+def replace_graph(ds, name):
+    ds.remove_graph(ds.graph(mapping.graph_id(name)))
+    return ds.graph(mapping.graph_id(name))
+
+
+# ITEM CONVERSIONS (CSV → RDF)
+# Worker: converts one item in its own graph, writes its TTL file and returns
+# the triples as N-Triples bytes for the parent to splice into the dataset
+def convert_item(name, fmt="turtle", compress=False):
+    spec = importlib.import_module(name).MAPPING
+    g = mapping.convert(spec)
+    output = write_item(g, spec, fmt, compress)
+    return output.name, g.serialize(format="nt", encoding="utf-8")
+
+
+def write_item(g, spec, fmt="turtle", compress=False):
+    return rdf_output.write_graph(
+        g, mapping.output_file(spec), fmt, compress, mapping.graph_id(spec["name"])
+    )
+
+
+def build_items(ds, specs, jobs=1, fmt="turtle", compress=False, records=None):
+    if records:
+        for spec in [spec for spec in specs if spec["name"] in records]:
+            g = convert_record(spec, records[spec["name"]], replace_graph(ds, spec["name"]))
+            output = write_item(g, spec, fmt, compress)
+            print(f"{output.name} generated successfully! (from {records[spec['name']].name})")
+        specs = [spec for spec in specs if spec["name"] not in records]
+
+    if jobs > 1 and len(specs) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(specs))) as pool:
+            results = pool.map(
+                partial(convert_item, fmt=fmt, compress=compress),
+                [spec["name"] for spec in specs],
+            )
+            for spec, (output, data) in zip(specs, results):
+                terms.parse(replace_graph(ds, spec["name"]), data=data, format="nt")
+                print(f"{output} generated successfully!")
+        return ds
+
+    for spec in specs:
+        g = mapping.convert(spec, replace_graph(ds, spec["name"]))
+        output = write_item(g, spec, fmt, compress)
+        print(f"{output.name} generated successfully!")
+    return ds
+
+
+# MERGE (item graphs + other TTL files in ttl/ + owl:sameAs from rrr_entities.csv
+# + curated edges from rrr_triples.csv)
+def write_merged(ds, fmt="turtle", compress=False):
+    output = rdf_output.write_graph(ds, merging.output_path, fmt, compress)
+    snapshot.write_snapshot(ds)
+    merging.write_sameas_index(merging.sameas_clusters(merging.sameas_pairs(ds)))
+    manifest.build_dir.mkdir(exist_ok=True)
+    ds.serialize(format="nquads", destination=str(manifest.DATASET_CACHE))
+    print(f"Merged dataset written to {output}")
+
+
+def build(full=False, jobs=1, fmt="turtle", compress=False, strict=False, records=False):
+    start = time.perf_counter()
+    specs = load_specs()
+    outputs = [rdf_output.output_file(mapping.output_file(spec), fmt, compress) for spec in specs]
+    merged_output = rdf_output.output_file(merging.output_path, fmt, compress)
+    extra_files = merging.collect_input_files(exclude=[mapping.output_file(spec) for spec in specs])
+
+    old = {} if full else manifest.load_manifest()
+    new = manifest.hash_inputs(extra_files)
+    new[RECORDS_KEY] = str(records)
+    records = record_files({spec["name"] for spec in specs}) if records else None
+    ds = new_dataset()
+    if old and manifest.DATASET_CACHE.is_file():
+        terms.parse_quads(ds, str(manifest.DATASET_CACHE))
+    else:
+        old = {}
+
+    def stale(inputs, output=None):
+        return manifest.changed(inputs, old, new) or (output is not None and not output.is_file())
+
+    # Item graphs whose CSV or spec (or record) changed; all of them when the
+    # source of the items was switched
+    source_changed = old.get(RECORDS_KEY, str(False)) != new[RECORDS_KEY]
+    stale_items = [
+        spec for spec, output in zip(specs, outputs)
+        if source_changed or stale(item_inputs(spec, records), output)
+    ]
+    build_items(ds, stale_items, jobs, fmt, compress, records)
+
+    # Other files of ttl/, the authority links and the curated edges
+    stale_extras = [f for f in extra_files if stale([f])]
+    for extra_file in stale_extras:
+        merging.parse_input_files([extra_file], replace_graph(ds, merging.input_stem(extra_file)))
+    entities_stale = stale([merging.csv_dir / "rrr_entities.csv", scripts_dir / "merging.py"])
+    if entities_stale:
+        merging.add_entity_links(replace_graph(ds, ENTITIES_GRAPH))
+    edges_stale = stale([merging.edges_csv, scripts_dir / "merging.py"])
+    if edges_stale:
+        merging.add_edges(replace_graph(ds, EDGES_GRAPH))
+
+    # Graphs of items or files that no longer exist
+    expected = {mapping.graph_id(name) for name in [spec["name"] for spec in specs] + [ENTITIES_GRAPH, EDGES_GRAPH]}
+    expected.update(mapping.graph_id(merging.input_stem(f)) for f in extra_files)
+    removed = [
+        g for g in ds.graphs()
+        if g.identifier != DATASET_DEFAULT_GRAPH_ID and g.identifier not in expected
+    ]
+    for g in removed:
+        ds.remove_graph(g)
+
+    merged_stale = stale_items or stale_extras or entities_stale or edges_stale or removed
+    if merged_stale or not merged_output.is_file():
+        write_merged(ds, fmt, compress)
+    else:
+        print("Merged dataset is up to date")
+
+    # Shapes of the merged dataset (with strict=True a violation fails the build)
+    if merged_stale or stale([scripts_dir / "validate.py"]) or strict:
+        violations = validate.report(validate.validate(ds))
+        if violations and strict:
+            raise SystemExit(f"Build failed: {len(violations)} violation(s) in the merged dataset")
+
+    # One JSON-LD document per entity, as JSON Lines
+    if merged_stale or stale([scripts_dir / "jsonld_export.py"], jsonld_export.OUTPUT_FILE):
+        count = jsonld_export.write_documents(ds)
+        print(f"{count} JSON-LD documents written to {jsonld_export.OUTPUT_FILE}")
+
+    # Entity pages (only those whose triples changed are rendered again)
+    if merged_stale or stale([scripts_dir / "site_pages.py"], site_pages.PAGES_DIR / "index.html"):
+        written = site_pages.generate(ds)
+        print(f"{len(written)} entity pages written to {site_pages.PAGES_DIR}")
+
+    # TEI → RDF and TEI → HTML
+    tei_output = rdf_output.output_file(xml_to_rdf.TTL_FILE, fmt, compress)
+    if stale([xml_to_rdf.XML_FILE, scripts_dir / "xml_to_rdf.py"], tei_output):
+        xml_to_rdf.main(fmt, compress)
+    if stale([xml_to_html.XML_FILE, xml_to_html.XSL_FILE, scripts_dir / "xml_to_html.py"], xml_to_html.OUT_FILE):
+        xml_to_html.main()
+    if stale([xml_to_rdf.XML_FILE, scripts_dir / "search_index.py", scripts_dir / "xml_to_rdf.py"],
+             search_index.INDEX_FILE):
+        search_index.main()
+
+    manifest.save_manifest(new)
+    print(f"Build completed in {time.perf_counter() - start:.2f}s "
+          f"({len(stale_items)} of {len(specs)} items rebuilt)")
+    return ds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the RDF dataset and the TEI edition.")
+    parser.add_argument("--full", action="store_true",
+                        help="ignore the build manifest and rebuild everything")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="convert items in N worker processes (0: one per CPU)")
+    parser.add_argument("--strict", action="store_true",
+                        help="fail if the merged dataset does not conform to the shapes of validate.py")
+    parser.add_argument("--records", action="store_true",
+                        help="build the items described by a MODS / VRA / EAD record of metadata/ from that record "
+                             "instead of their CSV")
+    rdf_output.add_format_arguments(parser)
+    args = parser.parse_args()
+    build(full=args.full, jobs=args.jobs or os.cpu_count(), fmt=args.format, compress=args.gzip, strict=args.strict,
+          records=args.records)
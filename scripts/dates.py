@@ -0,0 +1,82 @@
+import numpy as np
+from pandas import Series, to_datetime
+from rdflib import URIRef, XSD
+
+import terms
+
+# DATE NORMALIZATION
+# Dates in the CSVs and in the archival records are free text: "1954",
+# "1954-10", "1942-07-24", but also "ca. 1960s", "circa 1954", "1954?" or
+# "1952-1954". A whole column is parsed at once:
+#   exact years, months and days    → xsd:gYear, xsd:gYearMonth, xsd:date
+#   approximate or uncertain dates,
+#   decades and ranges              → EDTF ("1954~", "196X~", "1952/1954")
+#   anything else                   → plain literal, kept as written
+# so that no literal carries a datatype its lexical form does not match.
+EDTF = URIRef("http://id.loc.gov/datatypes/edtf/EDTF")
+
+_QUALIFIER = r"(?:ca\.?|c\.|circa|about|approx(?:\.|imately)?)"
+_DATE = r"\d{4}(?:-\d{2}(?:-\d{2})?)?|\d{3}0s"
+DATE_PATTERN = (
+    rf"^\s*(?P<approx>{_QUALIFIER}\s*)?(?P<start>{_DATE})"
+    rf"(?:\s*(?:/|-|–|to)\s*(?P<end>{_DATE}))?\s*(?P<mark>[?~%])?\s*$"
+)
+_PRECISION = {4: XSD.gYear, 7: XSD.gYearMonth, 10: XSD.date}
+
+
+def _valid(dates):
+    # Months and days must exist in the calendar ("1954-13" and "1954-02-30" do not)
+    lengths = dates.str.len()
+    full = dates.where(lengths != 7, dates + "-01").where(lengths.isin([7, 10]))
+    parsed = to_datetime(full, format="%Y-%m-%d", errors="coerce")
+    return ~lengths.isin([7, 10]) | parsed.notna()
+
+
+def _edtf(dates):
+    # "1960s" → "196X" (EDTF unspecified digit)
+    return dates.str.replace(r"^(\d{3})0s$", r"\1X", regex=True)
+
+
+# Lexical forms and datatypes (None for plain literals) of a sequence of values
+def normalize(values):
+    text = Series(values, dtype=object).astype(str).str.strip()
+    parts = text.str.extract(DATE_PATTERN, flags=2)  # re.IGNORECASE
+    start, end = parts["start"], parts["end"]
+
+    matched = start.notna() & _valid(start.fillna("")) & (end.isna() | _valid(end.fillna("")))
+    approximate = parts["approx"].notna() | (parts["mark"] == "~")
+    uncertain = parts["mark"] == "?"
+    qualifier = np.select(
+        [(approximate & uncertain) | (parts["mark"] == "%"), approximate, uncertain],
+        ["%", "~", "?"],
+        "",
+    )
+    qualifier = Series(qualifier, index=text.index)
+
+    decade = start.str.endswith("s", na=False) | end.str.endswith("s", na=False)
+    exact = matched & end.isna() & (qualifier == "") & ~decade
+
+    edtf = _edtf(start.fillna("")) + qualifier
+    edtf = edtf.where(end.isna(), edtf + "/" + _edtf(end.fillna("")) + qualifier)
+
+    lexical = np.where(exact, start, np.where(matched, edtf, text)).astype(object)
+    datatypes = np.full(len(text), None, dtype=object)
+    datatypes[exact.to_numpy()] = [_PRECISION[len(v)] for v in start[exact]]
+    datatypes[(matched & ~exact).to_numpy()] = EDTF
+    return lexical, datatypes
+
+
+# Literal terms of a sequence of date values, each distinct value parsed once
+def literals(values):
+    values = list(values)
+    distinct = list(dict.fromkeys(values))
+    lexical, datatypes = normalize(distinct)
+    made = {
+        value: terms.literal(form, datatype=datatype)
+        for value, form, datatype in zip(distinct, lexical, datatypes)
+    }
+    return [made[value] for value in values]
+
+
+def literal(value):
+    return literals([value])[0]
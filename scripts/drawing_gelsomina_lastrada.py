@@ -1,92 +1,40 @@
-from pandas import read_csv
-from rdflib import Namespace, Graph, RDF, URIRef, Literal, XSD
-
-# NAMESPACES
-rrr = Namespace("https://github.com/CineFiles25/TheRevolussionOfRenzoRenzi/")
-schema = Namespace("https://schema.org/")
-dcterms = Namespace("http://purl.org/dc/terms/")
-dc = Namespace("http://purl.org/dc/elements/1.1/")
-crm = Namespace("http://www.cidoc-crm.org/cidoc-crm/")
-foaf = Namespace("http://xmlns.com/foaf/0.1/")
-owl = Namespace("http://www.w3.org/2002/07/owl#")
-skos = Namespace("http://www.w3.org/2004/02/skos/core#")
-
-# GRAPH
-g = Graph()
-
-# Bindings
-g.bind("rrr", rrr)
-g.bind("schema", schema)
-g.bind("dcterms", dcterms)
-g.bind("dc", dc)
-g.bind("crm", crm)
-g.bind("foaf", foaf)
-g.bind("owl", owl)
-g.bind("skos", skos)
-
-# ENTITIES
-artwork = URIRef(rrr + "drawing_gelsomina_lastrada")
-la_strada = URIRef(rrr + "la_strada_film")
-renzi = URIRef(rrr + "renzo_renzi")
-masina = URIRef(rrr + "giulietta_masina")
-renzi_collection = URIRef(rrr + "renzi_collection")
-renzi_library = URIRef(rrr + "renzo_renzi_library")
-cineteca = URIRef(rrr + "cineteca_di_bologna")
-
-# LOAD CSV
-df = read_csv("../csv/drawing_gelsomina_lastrada.csv", keep_default_na=False, encoding="utf-8")
-
-# RESOURCE TYPE
-g.add((artwork, RDF.type, schema.VisualArtwork))
+from mapping import AUTHORITY_COLUMNS, main
 
 # CSV → RDF MAPPING
-for _, row in df.iterrows():
-    # Title
-    if row.get("title"):
-        g.add((artwork, dcterms.title, Literal(row["title"])))
-    # Creator (resource)
-    g.add((artwork, schema.creator, renzi))
-    # Depicted person
-    g.add((artwork, foaf.depicts, masina))
-    # Creation date
-    if row.get("creation_date"):
-        g.add((artwork, dcterms.created, Literal(row["creation_date"])))
-    # Technique / material
-    if row.get("technique"):
-        g.add((artwork, dcterms.medium, Literal(row["technique"])))
-    if row.get("material"):
-        g.add((artwork, dcterms.material, Literal(row["material"])))
-    # Dimensions
-    if row.get("dimensions"):
-        g.add((artwork, dcterms.extent, Literal(row["dimensions"])))
-    # Rights
-    if row.get("rights"):
-        g.add((artwork, dcterms.rights, Literal(row["rights"])))
-    # Description
-    if row.get("description"):
-        g.add((artwork, dcterms.description, Literal(row["description"])))
-    # Link to La Strada
-    g.add((artwork, schema.about, la_strada))
-
-    # Authority files — VIAF
-    if row.get("viaf_uri"):
-        g.add((artwork, owl.sameAs, URIRef(row["viaf_uri"])))
-    # Authority files — Wikidata
-    if row.get("wikidata_uri"):
-        g.add((artwork, owl.sameAs, URIRef(row["wikidata_uri"])))
-    # Authority files — LCNAF / altre authority
-    if row.get("authority_uri"):
-        g.add((artwork, owl.sameAs, URIRef(row["authority_uri"])))
-    # Concetto SKOS
-    if row.get("skos_concept_uri"):
-        g.add((artwork, skos.closeMatch, URIRef(row["skos_concept_uri"])))
-
-    # COLLECTION & LOCATION
-    g.add((artwork, dcterms.isPartOf, renzi_collection))
-    g.add((renzi_collection, dcterms.hasPart, artwork))
-    g.add((artwork, schema.location, renzi_library))
-    g.add((artwork, crm.P52_has_current_owner, cineteca))
-
-# SERIALIZATION
-g.serialize(format="turtle", destination="../ttl/drawing_gelsomina_lastrada.ttl")
-print("drawing_gelsomina_lastrada.ttl generated successfully!")
+MAPPING = {
+    "name": "drawing_gelsomina_lastrada",
+    "subject": "rrr:drawing_gelsomina_lastrada",
+    # RESOURCE TYPE
+    "type": "schema:VisualArtwork",
+    "constants": [
+        # Creator (resource)
+        ("schema:creator", "rrr:renzo_renzi"),
+        # Depicted person
+        ("foaf:depicts", "rrr:giulietta_masina"),
+        # Link to La Strada
+        ("schema:about", "rrr:la_strada_film"),
+        # COLLECTION & LOCATION
+        ("dcterms:isPartOf", "rrr:renzi_collection"),
+        ("^dcterms:hasPart", "rrr:renzi_collection"),
+        ("schema:location", "rrr:renzo_renzi_library"),
+        ("crm:P52_has_current_owner", "rrr:cineteca_di_bologna"),
+    ],
+    "columns": [
+        # Title
+        ("title", "dcterms:title"),
+        # Creation date
+        ("creation_date", "dcterms:created", {"kind": "date"}),
+        # Technique / material
+        ("technique", "dcterms:medium"),
+        ("material", "dcterms:material"),
+        # Dimensions
+        ("dimensions", "dcterms:extent"),
+        # Rights
+        ("rights", "dcterms:rights"),
+        # Description
+        ("description", "dcterms:description"),
+    ] + AUTHORITY_COLUMNS,
+}
+
+if __name__ == "__main__":
+    main(MAPPING)
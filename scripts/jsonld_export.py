@@ -0,0 +1,118 @@
+import argparse
+import json
+from pathlib import Path
+from rdflib import BNode, Graph, Literal, RDF, RDFS, XSD
+
+import mapping
+import query
+import rdf_output
+import snapshot
+import terms
+
+# Locate directories
+script_path = Path(__file__).resolve()
+ttl_dir = script_path.parents[1] / "ttl"
+
+OUTPUT_FILE = ttl_dir / "full_dataset.jsonl"
+
+# FIXED CONTEXT
+# Every document is compacted against the same prefixes, so consumers can
+# read any line without looking at the others
+CONTEXT = {prefix: str(ns) for prefix, ns in dict(mapping.PREFIXES, rdfs=RDFS).items()}
+
+# Longest namespaces first, so that a namespace nested in another wins
+_NAMESPACES = sorted(CONTEXT.items(), key=lambda item: -len(item[1]))
+
+
+def compact_iri(iri):
+    iri = str(iri)
+    for prefix, ns in _NAMESPACES:
+        if iri.startswith(ns) and len(iri) > len(ns):
+            return f"{prefix}:{iri[len(ns):]}"
+    return iri
+
+
+def _value(term, describe, seen):
+    if isinstance(term, Literal):
+        if term.language:
+            return {"@value": str(term), "@language": term.language}
+        if term.datatype is not None and term.datatype != XSD.string:
+            return {"@value": str(term), "@type": compact_iri(term.datatype)}
+        return str(term)
+    if isinstance(term, BNode):
+        # Blank nodes have no document of their own: embed them
+        if describe is not None and term not in seen:
+            return _node(None, describe(term), describe, seen | {term})
+        return {"@id": f"_:{term}"}
+    return {"@id": compact_iri(term)}
+
+
+def _node(subject, properties, describe, seen):
+    node = {} if subject is None else {"@id": compact_iri(subject)}
+    values = {}
+    for p, o in properties:
+        if p == RDF.type:
+            values.setdefault("@type", []).append(compact_iri(o))
+        else:
+            values.setdefault(compact_iri(p), []).append(_value(o, describe, seen))
+    for key in sorted(values, key=lambda k: (k != "@type", k)):
+        items = values[key]
+        if key == "@type":
+            items = sorted(set(items))
+        else:
+            items = sorted(items, key=lambda v: json.dumps(v, sort_keys=True, ensure_ascii=False))
+        node[key] = items[0] if len(items) == 1 else items
+    return node
+
+
+# Compact, framed JSON-LD document of one entity: its (predicate, object)
+# pairs, with the blank nodes it points to described by describe(bnode)
+# embedded in place
+def entity_document(subject, properties, describe=None, context=True):
+    node = _node(subject, properties, describe, frozenset())
+    return {"@context": CONTEXT, **node} if context else node
+
+
+# One document per IRI subject of g, in IRI order
+def iter_documents(g, context=True):
+    def describe(bnode):
+        return g.predicate_objects(bnode)
+
+    subjects = sorted({s for s in g.subjects() if not isinstance(s, BNode)})
+    for subject in subjects:
+        yield entity_document(subject, g.predicate_objects(subject), describe, context)
+
+
+# Writes the documents as JSON Lines (gzipped if the path ends in .gz);
+# returns the number of documents
+def write_documents(g, destination=OUTPUT_FILE, context=True):
+    count = 0
+    with rdf_output.open_output(destination) as out:
+        for doc in iter_documents(g, context):
+            out.write(json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+            out.write(b"\n")
+            count += 1
+    return count
+
+
+def load_graph(source=None):
+    source = Path(source) if source else query.dataset_file()
+    if source.suffix == ".snap":
+        return snapshot.load_snapshot(source).to_graph()
+    g = mapping.bind_namespaces(Graph())
+    terms.parse(g, str(source), format="turtle")
+    return g
+
+
+def main(source=None, destination=OUTPUT_FILE):
+    count = write_documents(load_graph(source), destination)
+    print(f"{count} JSON-LD documents written to {destination}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the merged dataset as one JSON-LD document per entity (JSON Lines).")
+    parser.add_argument("--source", help="Turtle file or snapshot to export (default: the merged dataset)")
+    parser.add_argument("--output", default=str(OUTPUT_FILE), help=f"output file (default: ttl/{OUTPUT_FILE.name}, "
+                                                                  "gzipped if it ends in .gz)")
+    args = parser.parse_args()
+    main(args.source, Path(args.output))
@@ -0,0 +1,58 @@
+import hashlib
+import json
+from pathlib import Path
+
+# Locate directories
+script_path = Path(__file__).resolve()
+base_dir = script_path.parents[1]
+
+# Build state (not versioned): input hashes of the last build and the merged
+# dataset cached as N-Quads, one named graph per item
+build_dir = base_dir / ".build"
+MANIFEST_FILE = build_dir / "manifest.json"
+DATASET_CACHE = build_dir / "full_dataset.nq"
+
+# Inputs tracked by the manifest
+TRACKED = [
+    "csv/*.csv",
+    "metadata/*.xml",
+    "tei_xslt/lastrada.xml",
+    "tei_xslt/*.xsl",
+    "scripts/*.py",
+]
+
+
+def relative(path):
+    return Path(path).resolve().relative_to(base_dir).as_posix()
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_inputs(extra=()):
+    paths = {p for pattern in TRACKED for p in base_dir.glob(pattern)}
+    paths.update(Path(p) for p in extra)
+    return {relative(p): file_hash(p) for p in sorted(paths)}
+
+
+def load_manifest():
+    if not MANIFEST_FILE.is_file():
+        return {}
+    with open(MANIFEST_FILE, encoding="utf-8") as f:
+        return json.load(f).get("inputs", {})
+
+
+def save_manifest(hashes):
+    build_dir.mkdir(exist_ok=True)
+    with open(MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump({"inputs": hashes}, f, indent=2, sort_keys=True)
+
+
+# True if any of the inputs was added, removed or edited since the last build
+def changed(inputs, old, new):
+    return any(old.get(relative(p)) != new.get(relative(p)) for p in inputs)
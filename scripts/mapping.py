@@ -0,0 +1,224 @@
+import argparse
+import numpy as np
+from pandas import Series, read_csv, notna, unique
+from pathlib import Path
+from rdflib import Namespace, Graph, RDF, RDFS, XSD
+
+import dates
+import rdf_output
+import terms
+
+# NAMESPACES
+rrr = Namespace("https://github.com/CineFiles25/TheRevolussionOfRenzoRenzi/")
+schema = Namespace("https://schema.org/")
+dcterms = Namespace("http://purl.org/dc/terms/")
+dc = Namespace("http://purl.org/dc/elements/1.1/")
+crm = Namespace("http://www.cidoc-crm.org/cidoc-crm/")
+foaf = Namespace("http://xmlns.com/foaf/0.1/")
+owl = Namespace("http://www.w3.org/2002/07/owl#")
+skos = Namespace("http://www.w3.org/2004/02/skos/core#")
+
+# Prefixes bound on every output graph
+BINDINGS = {
+    "rrr": rrr,
+    "schema": schema,
+    "dcterms": dcterms,
+    "dc": dc,
+    "crm": crm,
+    "foaf": foaf,
+    "owl": owl,
+    "skos": skos,
+}
+
+# Prefixes accepted in mapping specs (CURIEs such as "dcterms:title")
+PREFIXES = dict(BINDINGS, rdf=Namespace(str(RDF)), rdfs=Namespace(str(RDFS)), xsd=Namespace(str(XSD)))
+
+# Locate directories
+script_path = Path(__file__).resolve()
+csv_dir = script_path.parents[1] / "csv"
+ttl_dir = script_path.parents[1] / "ttl"
+
+# Authority columns shared by every item CSV
+AUTHORITY_COLUMNS = [
+    # Authority files — VIAF
+    ("viaf_uri", "owl:sameAs", {"kind": "iri"}),
+    # Authority files — Wikidata
+    ("wikidata_uri", "owl:sameAs", {"kind": "iri"}),
+    # Authority files — LCNAF / altre authority
+    ("authority_uri", "owl:sameAs", {"kind": "iri"}),
+    # Concetto SKOS
+    ("skos_concept_uri", "skos:closeMatch", {"kind": "iri"}),
+]
+
+
+def expand(curie):
+    # "prefix:local" → URIRef; full IRIs are passed through unchanged
+    prefix, sep, local = curie.partition(":")
+    if sep and prefix in PREFIXES and not local.startswith("//"):
+        return terms.iri(PREFIXES[prefix] + local)
+    return terms.iri(curie)
+
+
+def bind_namespaces(g):
+    for prefix, namespace in BINDINGS.items():
+        g.bind(prefix, namespace)
+    return g
+
+
+def new_graph():
+    return bind_namespaces(Graph())
+
+
+def load_csv(path):
+    # Every cell is read as text: datatypes come from the mapping, not from pandas
+    return read_csv(path, keep_default_na=False, dtype=str, encoding="utf-8")
+
+
+# TERM FACTORIES
+def _term_factory(options):
+    kind = options.get("kind", "literal")
+    if kind == "iri":
+        return terms.iri
+    if kind == "local":
+        return lambda value: terms.iri(rrr + value)
+    if kind != "literal":
+        raise ValueError(f"Unknown column kind: {kind}")
+
+    datatype = options.get("datatype")
+    datatype = expand(datatype) if datatype else None
+    lang = options.get("lang")
+    return lambda value: terms.literal(value, datatype=datatype, lang=lang)
+
+
+# Declared date datatypes are a hint, not a promise: these columns go through
+# the date normalization like the ones of kind "date"
+DATE_DATATYPES = {XSD.date, XSD.gYear, XSD.gYearMonth}
+
+
+# Terms of a batch of distinct cell values; dates are parsed all at once
+def _batch_factory(options):
+    datatype = options.get("datatype")
+    if options.get("kind") == "date" or (datatype and expand(datatype) in DATE_DATATYPES):
+        return dates.literals
+    make = _term_factory(options)
+    return lambda values: [make(value) for value in values]
+
+
+def _compile_column(column, predicate, options=None):
+    options = options or {}
+    p = expand(predicate)
+    make = _batch_factory(options)
+    separator = options.get("separator")
+
+    # Returns the column's quads for Graph.addN: empty cells are dropped with a
+    # boolean mask and each distinct cell value is turned into a term only once
+    def emit(df, subjects, g):
+        if column not in df.columns:
+            return []
+        cells = df[column].to_numpy(dtype=object)
+        mask = (cells != "") & notna(subjects)
+        if not mask.any():
+            return []
+        cells = cells[mask]
+        subjects = subjects[mask]
+
+        if separator:
+            # Multi-valued cells: one row per value, the row's subject repeated
+            # through the index, empty entries (e.g. a trailing separator) dropped
+            values = Series(cells).str.split(separator, regex=False).explode().str.strip()
+            values = values[values != ""]
+            if values.empty:
+                return []
+            subjects = subjects[values.index.to_numpy()]
+            cells = values.to_numpy(dtype=object)
+
+        values = unique(cells)
+        objects = dict(zip(values, make(values)))
+        return [(s, p, objects[value], g) for s, value in zip(subjects, cells)]
+
+    return emit
+
+
+def _compile_constant(predicate, obj):
+    # "^predicate" states the triple in the inverse direction (obj predicate subject)
+    if predicate.startswith("^"):
+        p, o = expand(predicate[1:]), expand(obj)
+        return lambda s: (o, p, s)
+    p, o = expand(predicate), expand(obj)
+    return lambda s: (s, p, o)
+
+
+# MAPPING ENGINE
+# A mapping spec is a dict with:
+#   name            item name, also the default CSV / TTL file stem
+#   subject         CURIE of the item (one subject for the whole file), or
+#   subject_column  column holding a local id per row (one subject per row)
+#   type            rdf:type of the item(s)
+#   constants       (predicate, object) pairs stated for every item subject;
+#                   a leading "^" on the predicate states the inverse triple
+#   triples         fixed (subject, predicate, object) triples
+#   columns         (column, predicate[, options]) where options may set
+#                   kind ("literal", "iri", "local", "date"), datatype, lang,
+#                   separator
+# compile_mapping() turns it once into a function converting a whole DataFrame.
+def compile_mapping(spec):
+    subject = expand(spec["subject"]) if spec.get("subject") else None
+    subject_column = spec.get("subject_column")
+    constants = list(spec.get("constants", []))
+    if spec.get("type"):
+        constants.insert(0, ("rdf:type", spec["type"]))
+    constants = [_compile_constant(*constant) for constant in constants]
+    fixed = [tuple(expand(term) for term in triple) for triple in spec.get("triples", [])]
+    emitters = [_compile_column(*column) for column in spec.get("columns", [])]
+
+    def convert(df, g):
+        if subject_column:
+            ids = df[subject_column].to_numpy(dtype=object)
+            items = {value: terms.iri(rrr + value) for value in unique(ids) if value}
+            subjects = np.array([items.get(value) for value in ids], dtype=object)
+            items = list(items.values())
+        else:
+            subjects = np.empty(len(df), dtype=object)
+            subjects.fill(subject)
+            items = [subject]
+
+        quads = [triple + (g,) for triple in fixed]
+        for s in items:
+            quads.extend(constant(s) + (g,) for constant in constants)
+        for emit in emitters:
+            quads.extend(emit(df, subjects, g))
+        g.addN(quads)
+        return g
+
+    return convert
+
+
+def csv_file(spec):
+    return csv_dir / spec.get("csv", spec["name"] + ".csv")
+
+
+def convert(spec, g=None):
+    if g is None:
+        g = new_graph()
+    df = load_csv(csv_file(spec))
+    return compile_mapping(spec)(df, g)
+
+
+def output_file(spec):
+    return ttl_dir / spec.get("output", spec["name"] + ".ttl")
+
+
+def graph_id(name):
+    return rrr["graph/" + name]
+
+
+def run(spec, fmt="turtle", compress=False):
+    g = convert(spec)
+    output = rdf_output.write_graph(g, output_file(spec), fmt, compress, graph_id(spec["name"]))
+    print(f"{output.name} generated successfully!")
+
+
+def main(spec):
+    parser = argparse.ArgumentParser(description=f"Convert csv/{spec['name']}.csv to RDF.")
+    args = rdf_output.add_format_arguments(parser).parse_args()
+    run(spec, args.format, args.gzip)
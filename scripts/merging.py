@@ -1,8 +1,16 @@
-from rdflib import Graph, Namespace, URIRef
+from rdflib import Dataset, Graph, Namespace, URIRef
 from pandas import read_csv
-import glob
+import argparse
+import hashlib
+import json
+import re
 from pathlib import Path
 
+import mapping
+import rdf_output
+import snapshot
+import terms
+
 # NAMESPACES
 rrr = Namespace("https://github.com/CineFiles25/TheRevolussionOfRenzoRenzi/")
 owl = Namespace("http://www.w3.org/2002/07/owl#")
@@ -14,38 +22,374 @@ if not ttl_dir.is_dir():
     ttl_dir = script_path.parents[2] / "ttl"
 csv_dir = script_path.parents[1] / "csv"
 
-# Collect all TTL files except the merged output
-ttl_files = sorted(
-    f for f in glob.glob(str(ttl_dir / "*.ttl"))
-    if not f.endswith("full_dataset.ttl")
-)
+# Output paths
+edges_csv = csv_dir / "rrr_triples.csv"
+output_path = ttl_dir / "full_dataset.ttl"
+nt_output_path = ttl_dir / "full_dataset.nt"
+sameas_index_path = ttl_dir / "full_dataset.sameas.json"
+smushed_output_path = ttl_dir / "full_dataset_smushed.ttl"
+
+
+# INPUT FILES
+# Item outputs in ttl/, in any of the output formats of rdf_output (Turtle,
+# N-Triples, N-Quads, optionally gzipped). When an item exists in several
+# formats the most recently written file is merged, so the merge follows the
+# format of the last build; on a tie the line-based file wins, as the
+# streaming merge reads it line by line instead of parsing it.
+INPUT_SUFFIXES = [".nq.gz", ".nq", ".nt.gz", ".nt", ".ttl"]
+
+
+def input_stem(path):
+    return Path(path).name.split(".")[0]
+
+
+def input_format(path):
+    suffixes = Path(path).suffixes
+    if ".nq" in suffixes:
+        return "nquads"
+    if ".nt" in suffixes:
+        return "nt"
+    return "turtle"
+
 
-merged_graph = Graph()
-merged_graph.bind("rrr", rrr)
-merged_graph.bind("owl", owl)
+# One input file per item, except the merged outputs (and any explicitly
+# excluded file, whatever its format)
+def collect_input_files(exclude=()):
+    excluded = {input_stem(f) for f in exclude} | {input_stem(output_path), input_stem(smushed_output_path)}
+    candidates = {}
+    for rank, suffix in enumerate(INPUT_SUFFIXES):
+        for f in ttl_dir.glob("*" + suffix):
+            if input_stem(f) not in excluded and "".join(f.suffixes) == suffix:
+                candidates.setdefault(input_stem(f), []).append((-f.stat().st_mtime_ns, rank, str(f)))
+    return sorted(min(files)[2] for files in candidates.values())
+
+
+# Parse each input file into g (terms shared between files are interned)
+def parse_input_files(files, g):
+    for f in files:
+        with rdf_output.open_input(f, "rb") as data:
+            terms.parse(g, data=data.read(), format=input_format(f))
+    return g
 
-# Parse each TTL file
-for ttl_file in ttl_files:
-    merged_graph.parse(ttl_file, format="turtle")
 
 # Add owl:sameAs triples from rrr_entities.csv
-entities_csv = csv_dir / "rrr_entities.csv"
-df = read_csv(str(entities_csv), keep_default_na=False, encoding="utf-8")
-
-for _, row in df.iterrows():
-    entity_id = row.get("id")
-    same_as = row.get("sameAs")
-    if entity_id and same_as:
-        merged_graph.add((
-            URIRef(rrr + entity_id),
-            owl.sameAs,
-            URIRef(same_as)
-        ))
-
-# Output path
-output_path = ttl_dir / "full_dataset.ttl"
+def add_entity_links(g):
+    entities_csv = csv_dir / "rrr_entities.csv"
+    df = read_csv(str(entities_csv), keep_default_na=False, encoding="utf-8")
+
+    for _, row in df.iterrows():
+        entity_id = row.get("id")
+        same_as = row.get("sameAs")
+        if entity_id and same_as:
+            g.add((
+                terms.iri(rrr + entity_id),
+                terms.iri(owl.sameAs),
+                terms.iri(same_as)
+            ))
+    return g
+
+
+# CURATED EDGES
+# csv/rrr_triples.csv: subject, predicate, object, object_type (iri | literal)
+# and a free-text note. Subjects and IRI objects are CURIEs, full IRIs or
+# local names in the rrr: namespace. The file is read in chunks and every
+# distinct value is expanded once per chunk, so the edge list can grow well
+# beyond what fits in a single DataFrame.
+EDGE_PREFIXES = dict(mapping.PREFIXES, cidoc=mapping.crm)
+EDGE_BATCH_SIZE = 100_000
+# Schemes of the full IRIs accepted next to the CURIEs
+EDGE_SCHEMES = {"http", "https", "urn"}
+
+
+def expand_edge_node(value):
+    prefix, sep, local = value.partition(":")
+    if sep and prefix in EDGE_PREFIXES and not local.startswith("//"):
+        return terms.iri(EDGE_PREFIXES[prefix] + local)
+    if sep and prefix in EDGE_SCHEMES:
+        return terms.iri(value)
+    if sep:
+        raise ValueError(f"Unknown prefix in {value!r}: {prefix}")
+    return terms.iri(rrr + value)
+
+
+def iter_edge_batches(path=edges_csv, batch_size=EDGE_BATCH_SIZE):
+    chunks = read_csv(
+        str(path), dtype=str, keep_default_na=False, encoding="utf-8",
+        usecols=["subject", "predicate", "object", "object_type"],
+        skip_blank_lines=True, chunksize=batch_size,
+    )
+    for chunk in chunks:
+        chunk = chunk.apply(lambda column: column.str.strip())
+        chunk = chunk[(chunk["subject"] != "") & (chunk["predicate"] != "") & (chunk["object"] != "")]
+        kinds = chunk["object_type"].str.lower().replace("", "iri")
+        unknown = sorted(set(kinds) - {"iri", "literal"})
+        if unknown:
+            raise ValueError(f"Unknown object_type in {Path(path).name}: {', '.join(unknown)}")
+
+        nodes = {v: expand_edge_node(v) for v in chunk["subject"].unique()}
+        nodes.update((v, expand_edge_node(v)) for v in chunk.loc[kinds == "iri", "object"].unique())
+        predicates = {v: expand_edge_node(v) for v in chunk["predicate"].unique()}
+        literals = {v: terms.literal(v) for v in chunk.loc[kinds == "literal", "object"].unique()}
+
+        yield [
+            (nodes[s], predicates[p], nodes[o] if kind == "iri" else literals[o])
+            for s, p, o, kind in zip(chunk["subject"], chunk["predicate"], chunk["object"], kinds)
+        ]
+
+
+# Adds the curated edges to g, one batch at a time
+def add_edges(g, path=edges_csv, batch_size=EDGE_BATCH_SIZE):
+    for batch in iter_edge_batches(path, batch_size):
+        g.addN(triple + (g,) for triple in batch)
+    return g
+
+
+# N-Triples lines of the curated edges
+def iter_edge_lines(path=edges_csv):
+    for batch in iter_edge_batches(path):
+        for s, p, o in batch:
+            yield f"{s.n3()} {p.n3()} {o.n3()} .\n"
+
+
+# SAMEAS CANONICALIZATION
+# Union-find over the owl:sameAs links: every equivalence class gets one
+# canonical IRI (the project's own rrr: IRI when there is one, else the
+# smallest), and the index maps every member of a class to it, so that a VIAF,
+# Wikidata or local IRI resolves with a single dictionary lookup.
+def _preference(iri):
+    return (not iri.startswith(str(rrr)), len(iri), iri)
+
+
+def sameas_clusters(pairs):
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in pairs:
+        a, b = find(a), find(b)
+        if a != b:
+            if _preference(b) < _preference(a):
+                a, b = b, a
+            parent[b] = a
+
+    clusters = {}
+    for iri in parent:
+        root = find(iri)
+        if iri != root:
+            clusters.setdefault(root, []).append(iri)
+    return {root: sorted(aliases) for root, aliases in sorted(clusters.items())}
+
+
+# owl:sameAs pairs of a graph (IRIs only)
+def sameas_pairs(g):
+    for s, o in g.subject_objects(owl.sameAs):
+        if isinstance(s, URIRef) and isinstance(o, URIRef):
+            yield str(s), str(o)
+
+
+# IRI → canonical IRI, for the canonical IRIs and all their aliases
+def canonical_map(clusters):
+    index = {}
+    for root, aliases in clusters.items():
+        index[root] = root
+        for alias in aliases:
+            index[alias] = root
+    return index
+
+
+def write_sameas_index(clusters, path=sameas_index_path):
+    index = {"clusters": clusters, "canonical": canonical_map(clusters)}
+    Path(path).write_text(json.dumps(index, ensure_ascii=False, indent=1), encoding="utf-8")
+    return path
+
+
+def load_sameas_index(path=sameas_index_path):
+    return json.loads(Path(path).read_text(encoding="utf-8"))["canonical"]
+
+
+# Smushed copy of g: every IRI is replaced by its canonical IRI, and each
+# class keeps one owl:sameAs link from the canonical IRI to each alias
+def smush(g, clusters):
+    index = canonical_map(clusters)
+    smushed = Graph()
+    for prefix, namespace in g.namespaces():
+        smushed.bind(prefix, namespace)
+
+    def canonical(term):
+        if isinstance(term, URIRef) and str(term) in index:
+            return terms.iri(index[str(term)])
+        return term
+
+    same_as = terms.iri(owl.sameAs)
+    smushed.addN(
+        (canonical(s), p, canonical(o), smushed)
+        for s, p, o in g
+        if not (p == same_as and isinstance(o, URIRef))
+    )
+    smushed.addN(
+        (terms.iri(root), same_as, terms.iri(alias), smushed)
+        for root, aliases in clusters.items() for alias in aliases
+    )
+    return smushed
+
+
+# STREAMING MERGE
+# N-Triples / N-Quads statement: subject, predicate, object and optional graph label
+_IRI = r'<[^>]*>'
+_BNODE = r'_:[A-Za-z0-9_\-.]*[A-Za-z0-9_\-]'
+_LITERAL = r'"(?:[^"\\]|\\.)*"(?:\^\^<[^>]*>|@[A-Za-z]+(?:-[A-Za-z0-9]+)*)?'
+_STATEMENT = re.compile(
+    rf'^\s*({_IRI}|{_BNODE})\s*({_IRI})\s*({_IRI}|{_BNODE}|{_LITERAL})'
+    rf'\s*(?:{_IRI}|{_BNODE})?\s*\.\s*$'
+)
+
+
+def _scoped_bnode(term, scope):
+    # Blank node labels are local to their file: prefix them so that two
+    # inputs using the same label do not collapse into one node
+    return f"_:f{scope}{term[2:]}" if term.startswith("_:") else term
+
+
+def graph_label(name):
+    return URIRef(rrr + "graph/" + name).n3()
+
+
+def _is_line_based(path):
+    return any(suffix in (".nt", ".nq") for suffix in Path(path).suffixes)
+
+
+# N-Triples lines of one input file; line-based formats (optionally gzipped)
+# are read as a stream (blank and comment lines skipped, anything else that
+# is not a statement is an error), any other RDF file is parsed on its own (never
+# together with the others)
+def iter_nt_lines(path, scope=0):
+    if _is_line_based(path):
+        with rdf_output.open_input(path) as f:
+            for number, line in enumerate(f, 1):
+                match = _STATEMENT.match(line)
+                if match:
+                    s, p, o = match.groups()
+                    yield f"{_scoped_bnode(s, scope)} {p} {_scoped_bnode(o, scope)} .\n"
+                elif line.strip() and not line.lstrip().startswith("#"):
+                    # A statement the pattern cannot read would otherwise be lost
+                    raise ValueError(f"{Path(path).name}, line {number}: not an N-Triples / N-Quads statement")
+        return
+
+    g = Graph()
+    g.parse(str(path))
+    data = g.serialize(format="nt", encoding="utf-8").decode("utf-8")
+    for line in data.splitlines():
+        if line.strip():
+            yield line + "\n"
+
+
+# owl:sameAs lines from rrr_entities.csv
+def iter_entity_lines():
+    entities_csv = csv_dir / "rrr_entities.csv"
+    df = read_csv(str(entities_csv), keep_default_na=False, encoding="utf-8")
+    df = df[(df["id"] != "") & (df["sameAs"] != "")]
+    for entity_id, same_as in zip(df["id"], df["sameAs"]):
+        yield f"{URIRef(rrr + entity_id).n3()} {owl.sameAs.n3()} {URIRef(same_as).n3()} .\n"
+
+
+# Writes the union of the inputs as N-Triples without building a Graph:
+# duplicates are dropped through a set of 64-bit line digests. With
+# quads=True every statement keeps the graph of its source file (N-Quads).
+# The owl:sameAs links written are appended to the same_as list, if given.
+def stream_merge(sources, destination=nt_output_path, entities=True, quads=False, same_as=None):
+    seen = set()
+    written = 0
+    same_as_n3 = owl.sameAs.n3()
+
+    def streams():
+        for scope, source in enumerate(sources):
+            name = Path(source).name.split(".")[0]
+            yield graph_label(name), iter_nt_lines(source, scope)
+        if entities:
+            yield graph_label("rrr_entities"), iter_entity_lines()
+            yield graph_label("rrr_triples"), iter_edge_lines()
+
+    with rdf_output.open_output(destination) as out:
+        for label, lines in streams():
+            for line in lines:
+                if quads:
+                    line = f"{line[:-3]} {label} .\n"
+                data = line.encode("utf-8")
+                key = int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+                if key in seen:
+                    continue
+                seen.add(key)
+                out.write(data)
+                written += 1
+                if same_as is not None:
+                    match = _STATEMENT.match(line)
+                    if match and match.group(2) == same_as_n3 and match.group(3).startswith("<"):
+                        same_as.append((match.group(1)[1:-1], match.group(3)[1:-1]))
+    return written
+
+
+# Optional pretty-printing pass: N-Triples / N-Quads → Turtle
+def nt_to_turtle(source=nt_output_path, destination=output_path):
+    quads = ".nq" in Path(source).suffixes
+    g = mapping.bind_namespaces(Dataset(default_union=True) if quads else Graph())
+    with rdf_output.open_input(source, "rb") as f:
+        g.parse(f, format="nquads" if quads else "nt")
+    g.serialize(destination=str(destination), format="turtle")
+    return g
+
+
+def main(stream=False, turtle=False, fmt="turtle", compress=False, smushed=False):
+    input_files = collect_input_files()
+
+    if stream:
+        quads = fmt == "nquads"
+        destination = rdf_output.output_file(nt_output_path, "nquads" if quads else "nt", compress)
+        same_as = []
+        written = stream_merge(input_files, destination, quads=quads, same_as=same_as)
+        write_sameas_index(sameas_clusters(same_as))
+        print(f"Merged {len(input_files)} files into {destination} ({written} statements)")
+        if turtle:
+            nt_to_turtle(destination)
+            print(f"Turtle written to {output_path}")
+        return
+
+    # The project prefixes, as the build binds them, so that both write the
+    # same Turtle
+    merged_graph = mapping.bind_namespaces(Graph())
+
+    parse_input_files(input_files, merged_graph)
+    add_entity_links(merged_graph)
+    add_edges(merged_graph)
+
+    # Serialize merged graph (and its binary snapshot for downstream consumers)
+    destination = rdf_output.write_graph(merged_graph, output_path, fmt, compress)
+    snapshot.write_snapshot(merged_graph)
+    print(f"Merged {len(input_files)} files into {destination}")
+    print(f"owl:sameAs triples added from rrr_entities.csv")
+    print(f"Curated edges added from {edges_csv.name}")
+
+    clusters = sameas_clusters(sameas_pairs(merged_graph))
+    write_sameas_index(clusters)
+    print(f"owl:sameAs index written to {sameas_index_path} ({len(clusters)} clusters)")
+    if smushed:
+        destination = rdf_output.write_graph(smush(merged_graph, clusters), smushed_output_path, fmt, compress)
+        print(f"Smushed dataset written to {destination}")
+
 
-# Serialize merged graph
-merged_graph.serialize(destination=str(output_path), format="turtle")
-print(f"Merged {len(ttl_files)} files into {output_path}")
-print(f"owl:sameAs triples added from rrr_entities.csv")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge the item files of ttl/ into the full dataset.")
+    parser.add_argument("--stream", action="store_true",
+                        help=f"stream the merge to {nt_output_path.name} without an in-memory graph")
+    parser.add_argument("--turtle", action="store_true",
+                        help=f"with --stream, also pretty-print {output_path.name}")
+    parser.add_argument("--smushed", action="store_true",
+                        help=f"also write {smushed_output_path.name}, with every owl:sameAs class "
+                             "collapsed onto its canonical IRI")
+    rdf_output.add_format_arguments(parser)
+    args = parser.parse_args()
+    main(args.stream, args.turtle, args.format, args.gzip, args.smushed)
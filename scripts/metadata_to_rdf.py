@@ -0,0 +1,421 @@
+import argparse
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from rdflib import RDF
+
+import dates
+import mapping
+from mapping import rrr, schema, dcterms, dc
+import rdf_output
+import terms
+
+# XML NAMESPACES (MODS, VRA Core 4, EAD 2002)
+MODS = "http://www.loc.gov/mods/v3"
+VRA = "http://www.vraweb.org/vracore4.htm"
+EAD = "urn:isbn:1-931666-22-9"
+mods_ns = {"m": MODS}
+vra_ns = {"v": VRA}
+ead_ns = {"e": EAD}
+
+# Locate directories
+script_path = Path(__file__).resolve()
+metadata_dir = script_path.parents[1] / "metadata"
+
+# The records describe the same items as the CSV mappings: their RDF is kept
+# out of ttl/*.ttl, so that the merge does not load both sources of an item
+# (build.py --records builds those items from the records instead)
+OUTPUT_FILE = mapping.ttl_dir / "metadata" / "metadata_records.ttl"
+
+# Record file suffixes, dropped to get the local id of a record without one
+_STANDARD_SUFFIX = re.compile(r"_(mods?|vra|ead)$")
+
+# HELPERS
+def _text(elem):
+    # Whitespace-normalised text content of an element ("" if missing)
+    if elem is None:
+        return ""
+    return " ".join("".join(elem.itertext()).split())
+
+
+def _texts(elem, path, ns):
+    return [t for t in (_text(e) for e in elem.findall(path, ns)) if t]
+
+
+def _literal(value):
+    return terms.literal(value)
+
+
+def date_literal(value):
+    # Typed (XSD or EDTF) when the value parses as a date, plain otherwise
+    return dates.literal(value)
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _paragraphs(elem, ns):
+    # Text of a descriptive section: one value per <p>, or the whole element
+    paragraphs = _texts(elem, "e:p", ns)
+    return paragraphs or [t for t in [_text(elem)] if t]
+
+
+# MODS → RDF
+MODS_TYPES = {
+    "text": schema.Book,
+    "moving image": schema.Movie,
+    "two dimensional moving image": schema.Movie,
+    "sound recording": schema.MusicRecording,
+    "sound recording-musical": schema.MusicRecording,
+    "still image": schema.Photograph,
+    "cartographic": schema.Map,
+}
+MODS_GENRE_TYPES = {
+    "interviews": schema.Interview,
+}
+
+
+def mods_record(record):
+    ns = mods_ns
+    record_id = next(iter(_texts(record, "m:identifier[@type='local']", ns)), None)
+    triples = []
+
+    def add(p, values, make=_literal):
+        triples.extend((p, make(value)) for value in values)
+
+    # RESOURCE TYPE
+    resource_types = _texts(record, "m:typeOfResource", ns)
+    genres = _texts(record, "m:genre", ns)
+    rdf_type = next(
+        (MODS_GENRE_TYPES[g.lower()] for g in genres if g.lower() in MODS_GENRE_TYPES),
+        next((MODS_TYPES[t] for t in resource_types if t in MODS_TYPES), schema.CreativeWork),
+    )
+    triples.append((RDF.type, rdf_type))
+    add(dcterms.type, resource_types)
+    add(schema.genre, genres)
+
+    # TITLES
+    for title_info in record.findall("m:titleInfo", ns):
+        main = dcterms.title if title_info.get("type") is None else dcterms.alternative
+        add(main, _texts(title_info, "m:title", ns))
+        add(dcterms.alternative, _texts(title_info, "m:subTitle", ns))
+
+    # NAMES (primary name as creator, the others as contributors)
+    for name in record.findall("m:name", ns):
+        label = ", ".join(_texts(name, "m:namePart", ns))
+        if label:
+            p = dcterms.creator if name.get("usage") == "primary" else dcterms.contributor
+            add(p, [label])
+
+    # PUBLICATION
+    for origin in record.findall("m:originInfo", ns):
+        add(dcterms.publisher, _texts(origin, "m:publisher", ns))
+        add(schema.locationCreated, _texts(origin, "m:place/m:placeTerm[@type='text']", ns))
+        for tag, p in (("dateIssued", dcterms.issued), ("dateCreated", dcterms.created)):
+            elements = origin.findall(f"m:{tag}", ns)
+            # The encoded form of a date wins over its transcription
+            encoded = [d for d in elements if d.get("encoding")]
+            add(p, [t for t in (_text(d) for d in (encoded or elements)[:1]) if t], date_literal)
+
+    # PHYSICAL DESCRIPTION
+    for physical in record.findall("m:physicalDescription", ns):
+        add(dcterms.extent, _texts(physical, "m:extent", ns))
+        add(dcterms["format"], _texts(physical, "m:form", ns))
+        add(dcterms.medium, _texts(physical, "m:note", ns))
+
+    # LANGUAGE
+    add(dcterms.language, _texts(record, "m:language/m:languageTerm[@type='text']", ns))
+
+    # ABSTRACT AND NOTES
+    add(dcterms.abstract, _texts(record, "m:abstract", ns))
+    for note in record.findall("m:note", ns):
+        text = _text(note)
+        if not text:
+            continue
+        note_type = note.get("type")
+        if note_type == "cataloging standard":
+            add(dcterms.conformsTo, [text])
+        elif note_type == "statement of responsibility":
+            add(schema.creditText, [text])
+        else:
+            add(dcterms.description, [text])
+
+    # SUBJECTS
+    for subject in record.findall("m:subject", ns):
+        add(dc.subject, _texts(subject, "m:topic", ns))
+        add(dc.subject, _texts(subject, "m:geographic", ns))
+        add(dc.subject, _texts(subject, "m:temporal", ns))
+        for name in subject.findall("m:name", ns):
+            add(dc.subject, [", ".join(_texts(name, "m:namePart", ns))])
+        add(dc.subject, _texts(subject, "m:titleInfo/m:title", ns))
+
+    # RELATED ITEMS (local identifiers become project resources)
+    for related in record.findall("m:relatedItem", ns):
+        titles = _texts(related, "m:titleInfo/m:title", ns)
+        if related.get("type") in ("series", "host"):
+            add(dcterms.isPartOf, titles)
+            continue
+        local_ids = _texts(related, "m:identifier[@type='local']", ns)
+        add(dcterms.relation, local_ids, lambda value: terms.iri(rrr + value))
+        if not local_ids:
+            add(dcterms.relation, titles)
+
+    # IDENTIFIERS, LOCATION AND RIGHTS
+    add(dcterms.identifier, [
+        _text(identifier) for identifier in record.findall("m:identifier", ns)
+        if identifier.get("type") != "local" and _text(identifier)
+    ])
+    add(schema.location, _texts(record, "m:location/m:physicalLocation", ns))
+    add(schema.url, _texts(record, "m:location/m:url", ns), terms.iri)
+    add(dcterms.rights, _texts(record, "m:accessCondition", ns))
+
+    return record_id, triples
+
+
+# VRA → RDF
+def vra_record(record):
+    ns = vra_ns
+    record_id = record.get("id")
+    triples = []
+
+    def add(p, values, make=_literal):
+        triples.extend((p, make(value)) for value in values)
+
+    # RESOURCE TYPE
+    work_types = _texts(record, "v:worktypeSet/v:worktype", ns)
+    is_photograph = any("photograph" in t.lower() for t in work_types)
+    triples.append((RDF.type, schema.Photograph if is_photograph else schema.VisualArtwork))
+    add(dcterms.type, work_types)
+
+    # TITLES
+    for title in record.findall("v:titleSet/v:title", ns):
+        add(dcterms.alternative if title.get("type") == "alternative" else dcterms.title,
+            [t for t in [_text(title)] if t])
+
+    # AGENTS (depicted agents as subjects, the preferred agent as creator)
+    for agent in record.findall("v:agentSet/v:agent", ns):
+        name = _text(agent.find("v:name", ns))
+        if not name:
+            continue
+        roles = [r.lower() for r in _texts(agent, "v:role", ns)]
+        if "subjects" in roles:
+            add(dc.subject, [name])
+        elif agent.get("pref") == "true":
+            add(dcterms.creator, [name])
+        else:
+            add(dcterms.contributor, [name])
+
+    # DATES
+    for date in record.findall("v:dateSet/v:date", ns):
+        p = dcterms.created if date.get("type", "creation") == "creation" else dcterms.date
+        add(p, _texts(date, "v:earliestDate", ns)[:1], date_literal)
+
+    # DESCRIPTION
+    add(dcterms.description, _texts(record, "v:descriptionSet/v:description", ns))
+    add(dcterms.description, _texts(record, "v:inscriptionSet/v:inscription", ns))
+
+    # LOCATION
+    for location in record.findall("v:locationSet/v:location", ns):
+        p = schema.location if location.get("type") == "repository" else dcterms.spatial
+        add(p, _texts(location, "v:name", ns))
+
+    # MATERIAL, TECHNIQUE AND MEASUREMENTS
+    add(dcterms.medium, _texts(record, "v:materialSet/v:material", ns))
+    add(dcterms.medium, _texts(record, "v:techniqueSet/v:technique", ns))
+    add(dcterms.extent, _texts(record, "v:measurementsSet/v:measurements", ns))
+
+    # RELATIONS AND SUBJECTS
+    add(dcterms.relation, _texts(record, "v:relationSet/v:relation", ns))
+    add(dc.subject, _texts(record, "v:subjectSet/v:subject/v:term", ns))
+
+    # RIGHTS
+    add(dcterms.rights, _texts(record, "v:rightsSet/v:rights/v:text", ns))
+    add(schema.copyrightHolder, _texts(record, "v:rightsSet/v:rights/v:rightsHolder", ns))
+
+    # IDENTIFIERS (accession numbers)
+    add(dcterms.identifier, _texts(record, "v:sourceSet/v:source/v:refid[@type='accession']", ns))
+
+    return record_id, triples
+
+
+# EAD → RDF
+# Descriptive sections of a component, directly or grouped in <descgrp>
+EAD_SECTIONS = {
+    "scopecontent": dcterms.description,
+    "bioghist": dcterms.description,
+    "note": dcterms.description,
+    "odd": dcterms.description,
+    "accessrestrict": dcterms.accessRights,
+    "userestrict": dcterms.rights,
+    "acqinfo": dcterms.provenance,
+    "custodhist": dcterms.provenance,
+    "phystech": dcterms.medium,
+    "relatedmaterial": dcterms.relation,
+}
+EAD_COMPONENTS = {"c"} | {f"c{n:02d}" for n in range(1, 13)}
+EAD_RECORD_LEVELS = ("item", "file")
+
+
+def _ead_sections(record):
+    for child in record:
+        if _local(child.tag) == "descgrp":
+            yield from _ead_sections(child)
+        else:
+            yield child
+
+
+def ead_record(record, standard=None):
+    ns = ead_ns
+    did = record.find("e:did", ns)
+    if did is None:
+        did = ET.Element(f"{{{EAD}}}did")
+    record_id = next(iter(_texts(did, "e:unitid[@type='local']", ns)), None) or record.get("id")
+    triples = []
+
+    def add(p, values, make=_literal):
+        triples.extend((p, make(value)) for value in values)
+
+    # RESOURCE TYPE
+    genres = _texts(record, "e:controlaccess/e:genreform", ns)
+    is_manuscript = record.get("type") == "manuscript" or any("manuscript" in g.lower() for g in genres)
+    triples.append((RDF.type, schema.Manuscript if is_manuscript else schema.ArchiveComponent))
+    add(dcterms.type, [record.get("level")] if record.get("level") else [])
+    add(schema.genre, genres)
+    add(dcterms.conformsTo, [standard] if standard else [])
+
+    # DESCRIPTIVE IDENTIFICATION
+    add(dcterms.title, _texts(did, "e:unittitle", ns))
+    add(dcterms.identifier, _texts(did, "e:unitid", ns))
+    for unit_date in did.findall("e:unitdate", ns):
+        value = unit_date.get("normal") or _text(unit_date)
+        add(dcterms.created, [value] if value else [], date_literal)
+    for origination in did.findall("e:origination", ns):
+        add(dcterms.creator, [_text(name) for name in origination if _text(name)])
+    add(dcterms.extent, _texts(did, "e:physdesc/e:extent", ns))
+    add(dcterms.medium, _texts(did, "e:physdesc/e:physfacet", ns))
+    add(dcterms.medium, _texts(did, "e:physfacet", ns))
+    add(dcterms.language, _texts(did, "e:langmaterial/e:language", ns))
+    add(schema.location, _texts(did, "e:repository/e:corpname", ns))
+    add(schema.location, _texts(did, "e:physloc", ns))
+    for related in did.findall("e:relatedmaterial", ns):
+        add(dcterms.relation, _paragraphs(related, ns))
+
+    # DESCRIPTIVE SECTIONS
+    for section in _ead_sections(record):
+        tag = _local(section.tag)
+        if tag == "odd" and section.get("type") == "alternativeTitle":
+            add(dcterms.alternative, _paragraphs(section, ns))
+        elif tag in EAD_SECTIONS:
+            add(EAD_SECTIONS[tag], _paragraphs(section, ns))
+        elif tag == "controlaccess":
+            add(dc.subject, [
+                _text(term) for term in section
+                if _local(term.tag) != "genreform" and _text(term)
+            ])
+
+    return record_id, triples
+
+
+# STREAMING INGESTION
+# Yields (record id, [(predicate, object), ...]) for every record of an XML
+# file. The file is read with iterparse: each record is converted when its end
+# tag is reached and then dropped from the tree, so memory stays bounded by the
+# size of one record whatever the size of the export.
+def iter_records(xml_file):
+    xml_file = Path(xml_file)
+    fallback = _STANDARD_SUFFIX.sub("", xml_file.stem)
+    stack = []
+    standard = None
+    ead_standard = None
+    count = 0
+
+    for event, elem in ET.iterparse(str(xml_file), events=("start", "end")):
+        if event == "start":
+            if standard is None:
+                standard = elem.tag[1:].split("}", 1)[0] if elem.tag.startswith("{") else ""
+                if standard not in (MODS, VRA, EAD):
+                    print(f"Skipping {xml_file.name}: not a MODS, VRA or EAD record")
+                    return
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        tag = _local(elem.tag)
+        record = None
+        if standard == MODS and tag == "mods":
+            record = mods_record(elem)
+        elif standard == VRA and tag == "work":
+            record = vra_record(elem)
+        elif standard == EAD:
+            if tag == "descrules":
+                ead_standard = _text(elem) or None
+            elif (tag in EAD_COMPONENTS or tag == "archdesc") and elem.get("level") in EAD_RECORD_LEVELS:
+                record = ead_record(elem, ead_standard)
+
+        if record is None:
+            continue
+        count += 1
+        record_id, triples = record
+        yield record_id or (fallback if count == 1 else f"{fallback}_{count}"), triples
+
+        # Release the converted record
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+
+def collect_xml_files(paths):
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.rglob("*.xml")) if path.is_dir() else [path])
+    return files
+
+
+def record_graph(record_id, triples, g=None):
+    if g is None:
+        g = mapping.new_graph()
+    subject = terms.iri(rrr + record_id)
+    g.addN((subject, p, o, g) for p, o in triples)
+    return g
+
+
+def convert(paths=(metadata_dir,), g=None):
+    if g is None:
+        g = mapping.new_graph()
+    for xml_file in collect_xml_files(paths):
+        for record_id, triples in iter_records(xml_file):
+            record_graph(record_id, triples, g)
+    return g
+
+
+def main(paths=(metadata_dir,), fmt="turtle", compress=False, output=OUTPUT_FILE):
+    # Turtle needs the whole graph to group the statements; the line-based
+    # formats are written record by record (one named graph per record in N-Quads)
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "turtle":
+        g = convert(paths)
+        destination = rdf_output.write_graph(g, output, fmt, compress)
+        print(f"{destination.name} generated successfully! ({len(g)} triples)")
+        return
+
+    destination = rdf_output.output_file(output, fmt, compress)
+    records = 0
+    with rdf_output.open_output(destination) as out:
+        for xml_file in collect_xml_files(paths):
+            for record_id, triples in iter_records(xml_file):
+                g = record_graph(record_id, triples)
+                out.write(rdf_output.graph_lines(g, fmt, mapping.graph_id(record_id)))
+                records += 1
+    print(f"{destination.name} generated successfully! ({records} records)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert MODS, VRA and EAD records to RDF.")
+    parser.add_argument("paths", nargs="*", default=[str(metadata_dir)],
+                        help="XML records or folders of records (default: metadata/)")
+    parser.add_argument("--output", default=str(OUTPUT_FILE),
+                        help=f"output file (default: ttl/metadata/{OUTPUT_FILE.name})")
+    rdf_output.add_format_arguments(parser)
+    args = parser.parse_args()
+    main(args.paths, args.format, args.gzip, Path(args.output))
@@ -1,95 +1,45 @@
-from pandas import read_csv
-from rdflib import Namespace, Graph, RDF, URIRef, Literal, XSD
-
-# NAMESPACES
-rrr = Namespace("https://github.com/CineFiles25/TheRevolussionOfRenzoRenzi/")
-schema = Namespace("https://schema.org/")
-dcterms = Namespace("http://purl.org/dc/terms/")
-dc = Namespace("http://purl.org/dc/elements/1.1/")
-foaf = Namespace("http://xmlns.com/foaf/0.1/")
-owl = Namespace("http://www.w3.org/2002/07/owl#")
-skos = Namespace("http://www.w3.org/2004/02/skos/core#")
-
-# GRAPH
-g = Graph()
-g.bind("rrr", rrr)
-g.bind("schema", schema)
-g.bind("dcterms", dcterms)
-g.bind("dc", dc)
-g.bind("foaf", foaf)
-g.bind("owl", owl)
-g.bind("skos", skos)
-
-# ENTITIES
-po_documentary = URIRef(rrr + "quando_il_po_e_dolce")
-renzo_renzi = URIRef(rrr + "renzo_renzi")
-enzo_masetti = URIRef(rrr + "enzo_masetti")
-delta_po_river = URIRef(rrr + "delta_po_river")
-
-# LOAD CSV
-df = read_csv("../csv/po_documentary.csv", keep_default_na=False, encoding="utf-8")
-
-# RESOURCE TYPE
-g.add((po_documentary, RDF.type, schema.Movie))
+from mapping import AUTHORITY_COLUMNS, main
 
 # CSV → RDF MAPPING
-for _, row in df.iterrows():
-    # Titles
-    if row.get("title"):
-        g.add((po_documentary, dcterms.title, Literal(row["title"])))
-    if row.get("other_title_information"):
-        g.add((po_documentary, dcterms.alternative, Literal(row["other_title_information"])))
-    # Edition / publication year
-    if row.get("edition"):
-        g.add((po_documentary, dcterms.issued, Literal(row["edition"], datatype=XSD.gYear)))
-    if row.get("publication_year"):
-        g.add((po_documentary, dcterms.issued, Literal(row["publication_year"], datatype=XSD.gYear)))
-    # Director / creator
-    g.add((po_documentary, schema.director, renzo_renzi))
-    g.add((po_documentary, dcterms.creator, renzo_renzi))
-    # Country
-    if row.get("country"):
-        g.add((po_documentary, schema.countryOfOrigin, Literal(row["country"])))
-    # Language
-    if row.get("language"):
-        g.add((po_documentary, schema.inLanguage, Literal(row["language"])))
-    # Production company
-    if row.get("production_company"):
-        g.add((po_documentary, dcterms.publisher, Literal(row["production_company"])))
-    # Length / duration
-    if row.get("length"):
-        g.add((po_documentary, dcterms.extent, Literal(row["length"])))
-    if row.get("duration"):
-        g.add((po_documentary, schema.duration, Literal(row["duration"])))
-    # Color
-    if row.get("colour"):
-        g.add((po_documentary, schema.color, Literal(row["colour"])))
-    # Film type / format
-    if row.get("film_type"):
-        g.add((po_documentary, dcterms.medium, Literal(row["film_type"])))
-    if row.get("format"):
-        g.add((po_documentary, dcterms.format, Literal(row["format"])))
-    # Sound
-    if row.get("sound"):
-        g.add((po_documentary, schema.sound, Literal(row["sound"])))
-    # About / place
-    g.add((po_documentary, schema.about, delta_po_river))
-    # Music
-    g.add((po_documentary, schema.musicBy, enzo_masetti))
-
-    # Authority files — VIAF
-    if row.get("viaf_uri"):
-        g.add((po_documentary, owl.sameAs, URIRef(row["viaf_uri"])))
-    # Authority files — Wikidata
-    if row.get("wikidata_uri"):
-        g.add((po_documentary, owl.sameAs, URIRef(row["wikidata_uri"])))
-    # Authority files — LCNAF / altre authority
-    if row.get("authority_uri"):
-        g.add((po_documentary, owl.sameAs, URIRef(row["authority_uri"])))
-    # Concetto SKOS
-    if row.get("skos_concept_uri"):
-        g.add((po_documentary, skos.closeMatch, URIRef(row["skos_concept_uri"])))
-
-# SERIALIZATION
-g.serialize(format="turtle", destination="../ttl/po_documentary.ttl")
-print("po_documentary.ttl generated successfully!")
+MAPPING = {
+    "name": "po_documentary",
+    "subject": "rrr:quando_il_po_e_dolce",
+    # RESOURCE TYPE
+    "type": "schema:Movie",
+    "constants": [
+        # Director / creator
+        ("schema:director", "rrr:renzo_renzi"),
+        ("dcterms:creator", "rrr:renzo_renzi"),
+        # About / place
+        ("schema:about", "rrr:delta_po_river"),
+        # Music
+        ("schema:musicBy", "rrr:enzo_masetti"),
+    ],
+    "columns": [
+        # Titles
+        ("title", "dcterms:title"),
+        ("other_title_information", "dcterms:alternative"),
+        # Edition / publication year
+        ("edition", "dcterms:issued", {"datatype": "xsd:gYear"}),
+        ("publication_year", "dcterms:issued", {"datatype": "xsd:gYear"}),
+        # Country
+        ("country", "schema:countryOfOrigin"),
+        # Language
+        ("language", "schema:inLanguage"),
+        # Production company
+        ("production_company", "dcterms:publisher"),
+        # Length / duration
+        ("length", "dcterms:extent"),
+        ("duration", "schema:duration"),
+        # Color
+        ("colour", "schema:color"),
+        # Film type / format
+        ("film_type", "dcterms:medium"),
+        ("format", "dcterms:format"),
+        # Sound
+        ("sound", "schema:sound"),
+    ] + AUTHORITY_COLUMNS,
+}
+
+if __name__ == "__main__":
+    main(MAPPING)
@@ -0,0 +1,315 @@
+import argparse
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+from rdflib import BNode, Graph, Literal, RDF, URIRef, Variable
+from rdflib.term import Identifier
+from rdflib.util import guess_format
+from rdflib.plugins.sparql import prepareQuery
+from rdflib.query import Result
+
+import snapshot
+import terms as rdf_terms
+
+SNAPSHOT_FILE = snapshot.SNAPSHOT_FILE
+TURTLE_FILE = snapshot.TURTLE_FILE
+
+# PERMUTATION INDEXES
+# The triples are held as integer term ids in three sorted copies, one per
+# access path, each stored column by column:
+#   spo  subject, predicate, object   → (s ? ?), (s p ?), (s p o), (? ? ?)
+#   pos  predicate, object, subject   → (? p ?), (? p o)
+#   osp  object, subject, predicate   → (? ? o), (s ? o)
+# A pattern with bound positions is a prefix of one of them, answered by
+# binary search on its columns.
+ORDERS = {"spo": (0, 1, 2), "pos": (1, 2, 0), "osp": (2, 0, 1)}
+
+
+def _index_for(bound):
+    s, p, o = bound
+    if s and not p and o:
+        return "osp"
+    if s or not (p or o):
+        return "spo"
+    if p:
+        return "pos"
+    return "osp"
+
+
+# Parsing dominates the cost of small queries: keep the parsed forms
+@lru_cache(maxsize=256)
+def _prepare(sparql, namespaces):
+    return prepareQuery(sparql, initNs=dict(namespaces))
+
+
+def prepare(sparql, namespaces=()):
+    return _prepare(sparql, tuple(sorted(dict(namespaces).items())))
+
+
+def clear_prepared():
+    _prepare.cache_clear()
+
+
+class Store:
+    # Read-only, in-memory store of the merged dataset
+
+    def __init__(self, terms, spo, namespaces=()):
+        self.terms = terms
+        self.ids = {rdf_terms.key(t): i for i, t in enumerate(terms)}
+        self.namespaces = dict(namespaces)
+        self._graph = None
+
+        spo = np.asarray(spo).reshape(-1, 3)
+        self.indexes = {}
+        for name, order in ORDERS.items():
+            rows = spo[:, order]
+            rows = rows[np.lexsort((rows[:, 2], rows[:, 1], rows[:, 0]))]
+            self.indexes[name] = [np.ascontiguousarray(rows[:, i]) for i in range(3)]
+
+    @classmethod
+    def from_graph(cls, g):
+        terms, _, spo = snapshot.encode(g.triples((None, None, None)))
+        return cls(terms, spo, g.namespaces())
+
+    @classmethod
+    def from_snapshot(cls, path=SNAPSHOT_FILE):
+        snap = snapshot.load_snapshot(path)
+        terms = [snap.term(i) for i in range(snap.header["terms"])]
+        return cls(terms, snap.spo, snap.header["namespaces"].items())
+
+    def __len__(self):
+        return len(self.indexes["spo"][0])
+
+    # TERMS
+    # Accepts rdflib terms, "?name" variables, CURIEs ("rrr:la_strada_film"),
+    # full IRIs and "a" (rdf:type)
+    def resolve(self, value):
+        if isinstance(value, Identifier) or not isinstance(value, str):
+            return value
+        if value.startswith("?"):
+            return Variable(value[1:])
+        if value == "a":
+            return RDF.type
+        if value.startswith("<") and value.endswith(">"):
+            return URIRef(value[1:-1])
+        prefix, sep, local = value.partition(":")
+        if sep and prefix in self.namespaces and not local.startswith("//"):
+            return URIRef(self.namespaces[prefix] + local)
+        return URIRef(value)
+
+    def term_id(self, term):
+        return self.ids.get(rdf_terms.key(self.resolve(term)))
+
+    # MATCHING
+    # Range of rows of an index whose first columns equal prefix
+    def _range(self, name, prefix):
+        columns = self.indexes[name]
+        start, end = 0, len(columns[0])
+        for column, value in zip(columns, prefix):
+            part = column[start:end]
+            start, end = (start + int(np.searchsorted(part, value, "left")),
+                          start + int(np.searchsorted(part, value, "right")))
+            if start == end:
+                break
+        return start, end
+
+    def _lookup(self, s, p, o):
+        pattern = (s, p, o)
+        name = _index_for([x is not None for x in pattern])
+        order = ORDERS[name]
+        prefix = []
+        for position in order:
+            if pattern[position] is None:
+                break
+            prefix.append(pattern[position])
+        return name, order, self._range(name, prefix)
+
+    # Number of triples matching a pattern of term ids (None = any)
+    def count_ids(self, s=None, p=None, o=None):
+        start, end = self._lookup(s, p, o)[2]
+        return end - start
+
+    # (s, p, o) id triples matching a pattern of term ids (None = any)
+    def match_ids(self, s=None, p=None, o=None):
+        name, order, (start, end) = self._lookup(s, p, o)
+        columns = self.indexes[name]
+        rows = np.empty((end - start, 3), dtype=columns[0].dtype)
+        for i, position in enumerate(order):
+            rows[:, position] = columns[i][start:end]
+        return rows
+
+    def triples(self, s=None, p=None, o=None):
+        pattern = []
+        for value in (s, p, o):
+            if value is None:
+                pattern.append(None)
+                continue
+            term_id = self.term_id(value)
+            if term_id is None:
+                return
+            pattern.append(term_id)
+        for row in self.match_ids(*pattern):
+            yield tuple(self.terms[i] for i in row)
+
+    def subjects(self, predicate=None, object=None):
+        return [s for s, _, _ in self.triples(None, predicate, object)]
+
+    def objects(self, subject=None, predicate=None):
+        return [o for _, _, o in self.triples(subject, predicate, None)]
+
+    # BASIC GRAPH PATTERNS
+    # Solutions of a list of (s, p, o) patterns as {Variable: term} dicts.
+    # Patterns are joined one at a time, most selective first, each one
+    # looked up once per partial solution (index nested-loop join).
+    def bgp(self, patterns):
+        compiled = []
+        for pattern in patterns:
+            row = []
+            for value in pattern:
+                value = self.resolve(value)
+                if isinstance(value, Variable):
+                    row.append(value)
+                    continue
+                term_id = self.term_id(value)
+                if term_id is None:
+                    return []
+                row.append(term_id)
+            compiled.append(row)
+
+        solutions = [{}]
+        bound = set()
+        remaining = list(compiled)
+        while remaining and solutions:
+            def cost(row):
+                known = sum(1 for x in row if not isinstance(x, Variable) or x in bound)
+                constants = [None if isinstance(x, Variable) else x for x in row]
+                return (-known, self.count_ids(*constants))
+
+            row = min(remaining, key=cost)
+            remaining.remove(row)
+
+            extended = []
+            for solution in solutions:
+                pattern = [solution.get(x) if isinstance(x, Variable) else x for x in row]
+                for match in self.match_ids(*pattern):
+                    new = dict(solution)
+                    for x, term_id in zip(row, map(int, match)):
+                        if isinstance(x, Variable) and new.setdefault(x, term_id) != term_id:
+                            break
+                    else:
+                        extended.append(new)
+            solutions = extended
+            bound.update(x for x in row if isinstance(x, Variable))
+
+        return [{var: self.terms[i] for var, i in solution.items()} for solution in solutions]
+
+    # SPARQL
+    # SELECT queries whose WHERE clause is a basic graph pattern (with
+    # DISTINCT / LIMIT / OFFSET) run on the indexes; anything else falls back
+    # to rdflib's evaluator over the dataset. Returns an rdflib Result, so
+    # that it can be serialized in any of the SPARQL result formats.
+    def execute(self, sparql):
+        prepared = prepare(sparql, self.namespaces)
+        bindings = self._select_bgp(prepared.algebra)
+        if bindings is None:
+            return self.graph().query(prepared)
+        result = Result("SELECT")
+        result.vars = list(prepared.algebra.PV)
+        result.bindings = bindings
+        return result
+
+    def _select_bgp(self, node):
+        if node.name != "SelectQuery":
+            return None
+        node = node.p
+        start, length, distinct = 0, None, False
+        if node.name == "Slice":
+            start, length, node = node.start or 0, node.length, node.p
+        if node.name in ("Distinct", "Reduced"):
+            distinct, node = True, node.p
+        if node.name != "Project" or node.p.name != "BGP":
+            return None
+
+        # Property paths (^p, p1/p2, p+, p*, p|q) are left to rdflib
+        if any(
+            not isinstance(x, (Variable, URIRef, Literal, BNode))
+            for triple in node.p.triples
+            for x in triple
+        ):
+            return None
+        # Blank nodes of the query ([] or _:b) are variables that are never
+        # projected, not terms of the data
+        patterns = [
+            tuple(Variable(f"_:{x}") if isinstance(x, BNode) else x for x in triple)
+            for triple in node.p.triples
+        ]
+        variables = node.PV
+        bindings = [{v: s[v] for v in variables if v in s} for s in self.bgp(patterns)]
+        if distinct:
+            unique = {}
+            for b in bindings:
+                unique.setdefault(tuple(b.get(v) for v in variables), b)
+            bindings = list(unique.values())
+        return bindings[start:start + length if length is not None else None]
+
+    # Rows of a SELECT query as tuples
+    def query(self, sparql):
+        return [tuple(row) for row in self.execute(sparql)]
+
+    def graph(self):
+        if self._graph is None:
+            self._graph = Graph()
+            for prefix, namespace in self.namespaces.items():
+                self._graph.bind(prefix, namespace)
+            self._graph.addN(
+                tuple(self.terms[i] for i in map(int, row)) + (self._graph,)
+                for row in self.match_ids()
+            )
+        return self._graph
+
+
+# Default source of the merged dataset: the binary snapshot when it is up to
+# date, else the Turtle file
+def dataset_file():
+    if SNAPSHOT_FILE.is_file() and (
+        not TURTLE_FILE.is_file() or SNAPSHOT_FILE.stat().st_mtime >= TURTLE_FILE.stat().st_mtime
+    ):
+        return SNAPSHOT_FILE
+    return TURTLE_FILE
+
+
+# Loads one or more RDF files (snapshots or any RDF syntax) into a single
+# store, by default the merged dataset
+def load(*paths):
+    paths = [Path(p) for p in paths] or [dataset_file()]
+    if len(paths) == 1 and paths[0].suffix == ".snap":
+        return Store.from_snapshot(paths[0])
+    g = Graph()
+    for path in paths:
+        if path.suffix == ".snap":
+            snapshot.load_snapshot(path).to_graph(g)
+        else:
+            rdf_terms.parse(g, str(path), format=guess_format(str(path)) or "turtle")
+    return Store.from_graph(g)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the merged dataset through its permutation indexes.")
+    parser.add_argument("sparql", nargs="?", help="SPARQL query to run")
+    parser.add_argument("--pattern", "-p", action="append", default=[], metavar="'S P O'",
+                        help="triple pattern of a basic graph pattern, e.g. '?item dcterms:isPartOf rrr:renzi_collection' "
+                             "(repeatable)")
+    parser.add_argument("--data", nargs="+", default=[], metavar="FILE",
+                        help="RDF files to load (default: the snapshot, or ttl/full_dataset.ttl)")
+    args = parser.parse_args()
+
+    store = load(*args.data)
+    if args.pattern:
+        solutions = store.bgp([pattern.split() for pattern in args.pattern])
+        for solution in solutions:
+            print("  ".join(f"?{var}={term.n3()}" for var, term in solution.items()))
+    elif args.sparql:
+        for row in store.query(args.sparql):
+            print("  ".join(term.n3() if term is not None else "-" for term in row))
+    else:
+        print(f"{len(store)} triples, {len(store.terms)} terms")
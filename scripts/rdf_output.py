@@ -0,0 +1,60 @@
+import gzip
+from pathlib import Path
+
+# Output formats: Turtle for the human-facing files, line-based N-Triples /
+# N-Quads (optionally gzipped) for machine consumption such as triple stores
+FORMATS = {
+    "turtle": ".ttl",
+    "nt": ".nt",
+    "nquads": ".nq",
+}
+
+
+def output_file(path, fmt="turtle", compress=False):
+    path = Path(path).with_suffix(FORMATS[fmt])
+    return path.with_name(path.name + ".gz") if compress else path
+
+
+def open_output(path):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "wb")
+    return open(path, "wb")
+
+
+def open_input(path, mode="rt"):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode, encoding="utf-8" if "t" in mode else None)
+    return open(path, mode, encoding="utf-8" if "t" in mode else None)
+
+
+# Serializes g to path, replacing its suffix with the one of fmt. A plain Graph
+# written as N-Quads gets graph_id (or its own identifier) as graph label.
+def write_graph(g, path, fmt="turtle", compress=False, graph_id=None):
+    path = output_file(path, fmt, compress)
+    with open_output(path) as out:
+        if fmt == "nquads" and not g.context_aware:
+            out.write(graph_lines(g, fmt, graph_id))
+        else:
+            g.serialize(destination=out, format=fmt, encoding="utf-8")
+    return path
+
+
+# N-Triples bytes of a plain Graph; as N-Quads, every line is labelled with
+# graph_id (or the graph's own identifier)
+def graph_lines(g, fmt="nt", graph_id=None):
+    data = g.serialize(format="nt", encoding="utf-8")
+    if fmt != "nquads":
+        return data
+    label = (graph_id or g.identifier).n3().encode("utf-8")
+    return b"".join(
+        line.rstrip()[:-1] + label + b" .\n"
+        for line in data.splitlines() if line.strip()
+    )
+
+
+def add_format_arguments(parser):
+    parser.add_argument("--format", choices=list(FORMATS), default="turtle",
+                        help="output format (default: turtle)")
+    parser.add_argument("--gzip", action="store_true",
+                        help="gzip the output (N-Triples / N-Quads)")
+    return parser
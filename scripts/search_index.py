@@ -0,0 +1,180 @@
+import argparse
+import json
+import re
+import unicodedata
+from lxml import etree
+from pathlib import Path
+
+import xml_to_rdf
+from xml_to_rdf import DIV, P, SP, STAGE, xml_ns, node_text, speech_directions
+
+# Locate directories
+script_path = Path(__file__).resolve()
+html_dir = script_path.parents[1] / "html"
+
+XML_FILE = xml_to_rdf.XML_FILE
+INDEX_FILE = html_dir / "lastrada.search.json"
+
+# FULL-TEXT INDEX
+# Static inverted index over the text of the screenplay, loaded by the site
+# (html/search.js) and queried client-side:
+#   units  one entry per searchable unit: [scene, id, kind, speaker, text]
+#          kind "p" (narrative paragraph), "sp" (dialogue of a speech) or
+#          "stage" (setting, transition or stage direction); id is the local
+#          name of the RDF resource (the speech or paragraph, or the scene);
+#          speaker is the character id of a speech ("" otherwise)
+#   terms  term → [[unit, position, position, ...], ...], positions being
+#          token offsets in the unit text (for phrase queries)
+# Terms are lower-cased and stripped of accents, so "zampano" finds "Zampanò".
+INDEX_VERSION = 1
+_TOKEN = re.compile(r"\w+")
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    return _TOKEN.findall(normalize(text))
+
+
+# SEARCHABLE UNITS
+# Same traversal and identifiers as xml_to_rdf.scene_to_rdf: paragraphs and
+# speeches are numbered among the children of their scene
+def scene_units(div, scene_counter):
+    scene_id = div.get(f"{xml_ns}id") or f"scene_{scene_counter}"
+    para_counter = 0
+    speech_counter = 0
+
+    for child in div:
+        tag = child.tag
+        if tag == STAGE and child.get("type") in ("setting", "transition"):
+            text = node_text(child)
+            if text:
+                yield scene_id, f"scene_{scene_id}", "stage", "", text
+
+        elif tag == P:
+            para_counter += 1
+            text = node_text(child)
+            if text:
+                yield scene_id, f"{scene_id}_para_{para_counter}", "p", "", text
+
+        elif tag == SP:
+            speech_counter += 1
+            speech_id = f"{scene_id}_speech_{speech_counter}"
+            speaker = (child.get("who") or "").replace("#", "")
+            dialogue = [node_text(p) for p in child if p.tag == P]
+            dialogue = " ".join(t for t in dialogue if t)
+            if dialogue:
+                yield scene_id, speech_id, "sp", speaker, dialogue
+            for stage in speech_directions(child):
+                text = node_text(stage)
+                if text:
+                    yield scene_id, speech_id, "stage", speaker, text
+
+
+# Streams the units of a TEI file, one scene at a time
+def iter_units(xml_file=XML_FILE):
+    scene_counter = 0
+    scene_numbers = []
+    for event, elem in etree.iterparse(str(xml_file), events=("start", "end"), tag=DIV):
+        if elem.get("type") != "scene":
+            continue
+        if event == "start":
+            scene_counter += 1
+            scene_numbers.append(scene_counter)
+            continue
+        yield from scene_units(elem, scene_numbers.pop())
+        elem.clear(keep_tail=True)
+
+
+def build_index(units):
+    rows = []
+    terms = {}
+    for unit, row in enumerate(units):
+        rows.append(list(row))
+        positions = {}
+        for position, term in enumerate(tokenize(row[-1])):
+            positions.setdefault(term, []).append(position)
+        for term, found in positions.items():
+            terms.setdefault(term, []).append([unit] + found)
+
+    return {
+        "version": INDEX_VERSION,
+        "fields": ["scene", "id", "kind", "speaker", "text"],
+        "units": rows,
+        "terms": dict(sorted(terms.items())),
+    }
+
+
+def write_index(index, path=INDEX_FILE):
+    data = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    Path(path).write_bytes(data)
+    return path
+
+
+def load_index(path=INDEX_FILE):
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+# QUERIES
+# Units containing every query term (as a phrase with phrase=True), optionally
+# restricted to a speaker and/or a kind of unit; the same logic as html/search.js
+def search(index, query, speaker=None, kind=None, phrase=False):
+    query_terms = tokenize(query)
+    if not query_terms:
+        return []
+
+    postings = []
+    for term in query_terms:
+        entries = index["terms"].get(term)
+        if not entries:
+            return []
+        postings.append({entry[0]: entry[1:] for entry in entries})
+
+    # Intersect starting from the rarest term
+    candidates = set(min(postings, key=len))
+    for term_postings in postings:
+        candidates &= term_postings.keys()
+
+    results = []
+    for unit in sorted(candidates):
+        scene, unit_id, unit_kind, unit_speaker, text = index["units"][unit]
+        if speaker and unit_speaker != speaker:
+            continue
+        if kind and unit_kind != kind:
+            continue
+        if phrase and len(postings) > 1:
+            starts = set(postings[0][unit])
+            for offset, term_postings in enumerate(postings[1:], 1):
+                starts &= {p - offset for p in term_postings[unit]}
+            if not starts:
+                continue
+        results.append(index["units"][unit])
+    return results
+
+
+def main(xml_file=XML_FILE, path=INDEX_FILE):
+    index = build_index(iter_units(xml_file))
+    write_index(index, path)
+    print(f"Search index written to {path} "
+          f"({len(index['units'])} units, {len(index['terms'])} terms)")
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build (or query) the full-text index of the TEI screenplay.")
+    parser.add_argument("--query", help="search the existing index instead of rebuilding it")
+    parser.add_argument("--speaker", help="with --query, only speeches of this character id (e.g. gelsomina)")
+    parser.add_argument("--kind", choices=["p", "sp", "stage"], help="with --query, only this kind of unit")
+    parser.add_argument("--phrase", action="store_true", help="with --query, match the terms as a phrase")
+    args = parser.parse_args()
+
+    if args.query:
+        for scene, unit_id, kind, speaker, text in search(
+            load_index(), args.query, args.speaker, args.kind, args.phrase
+        ):
+            print(f"[{scene}] {unit_id} ({kind}{', ' + speaker if speaker else ''}): {text}")
+    else:
+        main()
@@ -0,0 +1,278 @@
+import argparse
+import hashlib
+import html
+import json
+from pathlib import Path
+from string import Template
+from rdflib import Graph, Literal, RDF, RDFS, URIRef
+
+import jsonld_export
+import manifest
+import mapping
+import merging
+import terms
+from xml_to_html import write_if_changed
+
+# Locate directories
+script_path = Path(__file__).resolve()
+html_dir = script_path.parents[1] / "html"
+
+TURTLE_FILE = merging.output_path
+PAGES_DIR = html_dir / "entities"
+PAGES_MANIFEST = manifest.build_dir / "site_pages.json"
+
+rrr = mapping.rrr
+schema, dcterms, dc, foaf = mapping.schema, mapping.dcterms, mapping.dc, mapping.foaf
+
+# Labels, in order of preference; entities without one are named after their IRI
+LABEL_PREDICATES = [dcterms.title, schema.name, foaf.name, RDFS.label, dc.title]
+
+# Browse indexes: entities typed as persons or places, and the entities the
+# items point to through these properties
+PERSON_TYPES = {foaf.Person, schema.Person}
+PERSON_PREDICATES = {
+    dcterms.creator, dc.creator, dcterms.contributor, schema.author, schema.creator,
+    schema.director, schema.musicBy, schema.actor, foaf.depicts,
+}
+PLACE_TYPES = {schema.Place, schema.City}
+PLACE_PREDICATES = {
+    schema.location, schema.contentLocation, schema.filmingLocation,
+    schema.productionLocation, schema.locationCreated, dcterms.spatial,
+}
+
+
+# TEMPLATES
+# Compiled once; every placeholder is filled with already escaped HTML
+PAGE = Template("""<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="UTF-8" />
+    <title>$title · The "Revolussion" of Renzo Renzi</title>
+    <meta name="viewport" content="width=device-width, initial-scale=1" />
+    <link rel="stylesheet" href="../../style.css" />$head
+  </head>
+  <body>
+    <header class="site-header">
+      <div class="header-inner">
+        <div class="site-branding">
+          <p class="site-kicker"><a href="index.html">Browse the dataset</a> · <a href="persons.html">Persons</a> · <a href="places.html">Places</a></p>
+          <h1 class="site-title">$title</h1>
+        </div>
+      </div>
+    </header>
+    <main>
+$body
+    </main>
+  </body>
+</html>
+""")
+SECTION = Template("""      <section class="section">
+        <h2>$heading</h2>
+$content
+      </section>""")
+TABLE = Template("""        <div class="table-wrap">
+          <table class="items-table">
+            <tbody>
+$rows
+            </tbody>
+          </table>
+        </div>""")
+ROW = Template("""              <tr><th>$key</th><td>$value</td></tr>""")
+LIST = Template("""        <ul>
+$items
+        </ul>""")
+ITEM = Template("""          <li>$value</li>""")
+JSON_LD = Template("""
+    <script type="application/ld+json">$data</script>""")
+
+
+def local_name(iri):
+    return str(iri)[len(str(rrr)):]
+
+
+def is_entity(term):
+    return isinstance(term, URIRef) and str(term).startswith(str(rrr)) and local_name(term) != ""
+
+
+def page_name(iri):
+    return f"{local_name(iri).replace('/', '_')}.html"
+
+
+class Site:
+    # Triples of the merged dataset grouped per entity, in one pass
+
+    def __init__(self, g):
+        self.g = g
+        self.outgoing = {}
+        self.incoming = {}
+        for s, p, o in g.triples((None, None, None)):
+            if is_entity(s):
+                self.outgoing.setdefault(s, []).append((p, o))
+            if is_entity(o):
+                self.incoming.setdefault(o, []).append((s, p))
+        self.entities = sorted(set(self.outgoing) | set(self.incoming))
+        self._labels = {}
+
+    def label(self, iri):
+        label = self._labels.get(iri)
+        if label is None:
+            values = dict(self.outgoing.get(iri, ()))
+            label = next(
+                (str(values[p]) for p in LABEL_PREDICATES if isinstance(values.get(p), Literal)),
+                None,
+            )
+            if label is None:
+                label = local_name(iri).replace("_", " ").strip().title() if is_entity(iri) else str(iri)
+            self._labels[iri] = label
+        return label
+
+    def curie(self, iri):
+        return jsonld_export.compact_iri(iri)
+
+    # Stable order of entities and of (entity, property) pairs
+    def sort_key(self, iri):
+        return self.label(iri), str(iri)
+
+    def pair_key(self, pair):
+        return self.label(pair[0]), self.curie(pair[1]), str(pair[0])
+
+    def types(self, iri):
+        return sorted(o for p, o in self.outgoing.get(iri, ()) if p == RDF.type)
+
+    # HTML of a term: entity pages are linked by label, other IRIs as is
+    def link(self, term):
+        if is_entity(term):
+            return f'<a href="{page_name(term)}">{html.escape(self.label(term))}</a>'
+        if isinstance(term, URIRef):
+            return f'<a href="{html.escape(str(term))}">{html.escape(self.curie(term))}</a>'
+        return html.escape(str(term))
+
+    # Framed JSON-LD description of an entity, as exported by jsonld_export
+    def json_ld(self, iri):
+        return jsonld_export.entity_document(iri, self.outgoing.get(iri, ()), self.g.predicate_objects)
+
+    # Everything a page is rendered from: a page is rebuilt only when this changes
+    def page_digest(self, iri, template_key):
+        digest = hashlib.sha256(template_key)
+        lines = [f"{p.n3()} {o.n3()} {self.label(o) if is_entity(o) else ''}"
+                 for p, o in self.outgoing.get(iri, ())]
+        lines += [f"^{p.n3()} {s.n3()} {self.label(s)}" for s, p in self.incoming.get(iri, ())]
+        for line in sorted(lines):
+            digest.update(line.encode("utf-8"))
+            digest.update(b"\n")
+        return digest.hexdigest()
+
+    def render_page(self, iri):
+        rows = []
+        for p, o in sorted(self.outgoing.get(iri, ()), key=lambda po: (self.curie(po[0]), po[1].n3())):
+            rows.append(ROW.substitute(key=html.escape(self.curie(p)), value=self.link(o)))
+        sections = []
+        if rows:
+            sections.append(SECTION.substitute(heading="Description", content=TABLE.substitute(rows="\n".join(rows))))
+
+        incoming = sorted(self.incoming.get(iri, ()), key=self.pair_key)
+        if incoming:
+            items = [ITEM.substitute(value=f"{self.link(s)} <small>({html.escape(self.curie(p))})</small>")
+                     for s, p in incoming]
+            sections.append(SECTION.substitute(heading="Referenced by", content=LIST.substitute(items="\n".join(items))))
+
+        data = json.dumps(self.json_ld(iri), ensure_ascii=False, indent=1).replace("</", "<\\/")
+        return PAGE.substitute(
+            title=html.escape(self.label(iri)),
+            head=JSON_LD.substitute(data=data),
+            body="\n".join(sections),
+        ).encode("utf-8")
+
+    # BROWSE INDEXES
+    def group_page(self, title, groups):
+        sections = []
+        for heading, members in groups:
+            items = [ITEM.substitute(value=value) for value in members]
+            sections.append(SECTION.substitute(heading=heading, content=LIST.substitute(items="\n".join(items))))
+        return PAGE.substitute(title=html.escape(title), head="", body="\n".join(sections)).encode("utf-8")
+
+    def by_type(self):
+        groups = {}
+        for iri in self.entities:
+            for rdf_type in self.types(iri) or [None]:
+                groups.setdefault(rdf_type, []).append(iri)
+        return [
+            (html.escape(self.curie(t)) if t is not None else "Untyped",
+             [self.link(iri) for iri in sorted(members, key=self.sort_key)])
+            for t, members in sorted(groups.items(), key=lambda tg: (tg[0] is None, self.curie(tg[0] or "")))
+        ]
+
+    # Entities of the given types or reached through the given properties,
+    # each with the entities pointing to it
+    def related(self, types, predicates):
+        members = {iri for iri in self.entities if types & set(self.types(iri))}
+        members.update(o for o in self.incoming if any(p in predicates for _, p in self.incoming[o]))
+        return [
+            (self.link(iri), [
+                f"{self.link(s)} <small>({html.escape(self.curie(p))})</small>"
+                for s, p in sorted(self.incoming.get(iri, ()), key=self.pair_key)
+            ])
+            for iri in sorted(members, key=self.sort_key)
+        ]
+
+    def index_pages(self):
+        return {
+            "index.html": self.group_page("Browse the dataset", self.by_type()),
+            "persons.html": self.group_page("Persons", self.related(PERSON_TYPES, PERSON_PREDICATES)),
+            "places.html": self.group_page("Places", self.related(PLACE_TYPES, PLACE_PREDICATES)),
+        }
+
+
+def load_pages_manifest(path=PAGES_MANIFEST):
+    if not Path(path).is_file():
+        return {}
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+# Renders the entity pages whose triples changed since the last run (all of
+# them with full=True), removes the pages of entities that no longer exist
+# and refreshes the browse indexes. Returns the files written.
+def generate(g, out_dir=PAGES_DIR, full=False):
+    out_dir = Path(out_dir)
+    site = Site(g)
+    template_key = script_path.read_bytes()
+    old = {} if full else load_pages_manifest()
+    new = {}
+    written = []
+
+    for iri in site.entities:
+        name = page_name(iri)
+        new[name] = site.page_digest(iri, template_key)
+        if old.get(name) == new[name] and (out_dir / name).is_file():
+            continue
+        if write_if_changed(out_dir / name, site.render_page(iri)):
+            written.append(out_dir / name)
+
+    # The pages are committed, so stale ones are found on disk rather than
+    # in the manifest (which a fresh clone does not have)
+    indexes = site.index_pages()
+    for path in out_dir.glob("*.html"):
+        if path.name not in new and path.name not in indexes:
+            path.unlink()
+
+    for name, data in indexes.items():
+        if write_if_changed(out_dir / name, data):
+            written.append(out_dir / name)
+
+    manifest.build_dir.mkdir(exist_ok=True)
+    PAGES_MANIFEST.write_text(json.dumps(new, indent=1, sort_keys=True), encoding="utf-8")
+    return written
+
+
+def main(source=TURTLE_FILE, full=False):
+    g = mapping.bind_namespaces(Graph())
+    terms.parse(g, str(source), format="turtle")
+    written = generate(g, full=full)
+    print(f"{len(written)} entity pages written to {PAGES_DIR}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render one HTML page per entity of the merged dataset.")
+    parser.add_argument("--full", action="store_true", help="render every page, not only the changed ones")
+    args = parser.parse_args()
+    main(full=args.full)
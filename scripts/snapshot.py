@@ -0,0 +1,197 @@
+import argparse
+import json
+from pathlib import Path
+import numpy as np
+from rdflib import BNode, Graph, Literal, URIRef
+
+import terms as rdf_terms
+
+# Locate directories
+script_path = Path(__file__).resolve()
+ttl_dir = script_path.parents[1] / "ttl"
+
+SNAPSHOT_FILE = ttl_dir / "full_dataset.snap"
+TURTLE_FILE = ttl_dir / "full_dataset.ttl"
+
+# Binary snapshot of a graph:
+#   magic (8 bytes) | header length (uint64) | JSON header | aligned sections
+# Sections are plain arrays, memory-mapped on load:
+#   kinds     uint8   per term: 0 IRI, 1 blank node, 2 literal
+#   offsets   uint64  per term + 1: slice of the term's text in `values`
+#   values    uint8   UTF-8 text of all terms (IRI, blank node id, lexical form)
+#   datatypes int32   per term: term id of the literal's datatype, or -1
+#   langs     int16   per term: index in header["langs"], or -1
+#   spo       uint32 (uint64 for > 2^32 terms), shape (n, 3): the triples as
+#             term ids, sorted by subject, predicate, object
+MAGIC = b"RRRSNAP1"
+IRI, BNODE, LITERAL = 0, 1, 2
+ALIGN = 8
+
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+# Interns the terms of the triples and returns (terms, triple id array)
+def encode(triples):
+    ids = {}
+    terms = []
+
+    def intern(term):
+        key = rdf_terms.key(term)
+        term_id = ids.get(key)
+        if term_id is None:
+            term_id = ids[key] = len(terms)
+            terms.append(term)
+        return term_id
+
+    rows = [(intern(s), intern(p), intern(o)) for s, p, o in triples]
+    # Datatype IRIs are terms too, so that literals refer to them by id
+    for term in list(terms):
+        if isinstance(term, Literal) and term.datatype is not None:
+            intern(term.datatype)
+
+    dtype = np.uint32 if len(terms) < 2 ** 32 else np.uint64
+    array = np.array(rows, dtype=dtype).reshape(-1, 3)
+    if len(array):
+        array = array[np.lexsort((array[:, 2], array[:, 1], array[:, 0]))]
+    return terms, ids, array
+
+
+def write_snapshot(g, path=SNAPSHOT_FILE):
+    terms, ids, triples = encode(g.triples((None, None, None)))
+
+    langs = sorted({t.language for t in terms if isinstance(t, Literal) and t.language})
+    lang_ids = {lang: i for i, lang in enumerate(langs)}
+    encoded = [str(t).encode("utf-8") for t in terms]
+
+    sections = {
+        "kinds": np.array(
+            [LITERAL if isinstance(t, Literal) else BNODE if isinstance(t, BNode) else IRI for t in terms],
+            dtype=np.uint8,
+        ),
+        "offsets": np.cumsum([0] + [len(v) for v in encoded], dtype=np.uint64),
+        "values": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "datatypes": np.array(
+            [ids[rdf_terms.key(t.datatype)] if isinstance(t, Literal) and t.datatype is not None else -1
+             for t in terms],
+            dtype=np.int32,
+        ),
+        "langs": np.array(
+            [lang_ids[t.language] if isinstance(t, Literal) and t.language else -1 for t in terms],
+            dtype=np.int16,
+        ),
+        "spo": triples,
+    }
+
+    header = {
+        "terms": len(terms),
+        "triples": len(triples),
+        "langs": langs,
+        "namespaces": {prefix: str(ns) for prefix, ns in g.namespaces()},
+        "sections": {},
+    }
+    # Offsets depend on the header length, which depends on the offsets: lay
+    # the sections out after a header padded to a fixed, generous size
+    header_size = _align(len(json.dumps(header)) + 96 * len(sections) + 256)
+    offset = len(MAGIC) + 8 + header_size
+    for name, array in sections.items():
+        header["sections"][name] = [offset, array.dtype.str, list(array.shape)]
+        offset = _align(offset + array.nbytes)
+    header_bytes = json.dumps(header).encode("utf-8").ljust(header_size)
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(header_size).tobytes())
+        f.write(header_bytes)
+        for name, array in sections.items():
+            f.seek(header["sections"][name][0])
+            f.write(np.ascontiguousarray(array).tobytes())
+    return path
+
+
+class Snapshot:
+    # Memory-mapped snapshot: arrays are read lazily by the OS, terms are
+    # decoded one at a time on request
+
+    def __init__(self, path=SNAPSHOT_FILE):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a graph snapshot: {self.path}")
+            header_size = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            self.header = json.loads(f.read(header_size))
+
+        for name, (offset, dtype, shape) in self.header["sections"].items():
+            if np.prod(shape) == 0:
+                array = np.empty(shape, dtype=dtype)
+            else:
+                array = np.memmap(self.path, dtype=dtype, mode="r", offset=offset, shape=tuple(shape))
+            setattr(self, name, array)
+        self._ids = None
+
+    def __len__(self):
+        return self.header["triples"]
+
+    def term(self, term_id):
+        start, end = self.offsets[term_id], self.offsets[term_id + 1]
+        value = self.values[start:end].tobytes().decode("utf-8")
+        kind = self.kinds[term_id]
+        if kind == IRI:
+            return URIRef(value)
+        if kind == BNODE:
+            return BNode(value)
+        datatype, lang = self.datatypes[term_id], self.langs[term_id]
+        return Literal(
+            value,
+            datatype=self.term(datatype) if datatype >= 0 else None,
+            lang=self.header["langs"][lang] if lang >= 0 else None,
+        )
+
+    # Term → id (the reverse dictionary is built on first use)
+    def lookup(self, term):
+        if self._ids is None:
+            self._ids = {self.term(i): i for i in range(self.header["terms"])}
+        return self._ids.get(term)
+
+    def triples(self):
+        terms = {}
+        for row in self.spo:
+            triple = []
+            for term_id in map(int, row):
+                if term_id not in terms:
+                    terms[term_id] = self.term(term_id)
+                triple.append(terms[term_id])
+            yield tuple(triple)
+
+    def to_graph(self, g=None):
+        if g is None:
+            g = Graph()
+        for prefix, namespace in self.header["namespaces"].items():
+            g.bind(prefix, namespace)
+        g.addN(triple + (g,) for triple in self.triples())
+        return g
+
+
+def load_snapshot(path=SNAPSHOT_FILE):
+    return Snapshot(path)
+
+
+# Regenerates the Turtle file from the snapshot
+def to_turtle(path=SNAPSHOT_FILE, destination=TURTLE_FILE):
+    g = load_snapshot(path).to_graph()
+    g.serialize(destination=str(destination), format="turtle")
+    return g
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect the binary snapshot of the merged dataset.")
+    parser.add_argument("--turtle", action="store_true",
+                        help=f"regenerate {TURTLE_FILE.name} from the snapshot")
+    args = parser.parse_args()
+
+    snapshot = load_snapshot()
+    print(f"{snapshot.path.name}: {snapshot.header['terms']} terms, {len(snapshot)} triples")
+    if args.turtle:
+        to_turtle()
+        print(f"Turtle written to {TURTLE_FILE}")
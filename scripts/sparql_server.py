@@ -0,0 +1,237 @@
+import argparse
+from collections import OrderedDict
+import re
+import threading
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs
+from wsgiref.simple_server import WSGIServer, make_server
+
+import query
+import terms
+import xml_to_rdf
+
+# SPARQL ENDPOINT
+# WSGI application serving the merged dataset and the TEI screenplay through
+# the SPARQL 1.1 Protocol (query operation):
+#   GET  /sparql?query=...
+#   POST /sparql  application/x-www-form-urlencoded (query=...)
+#   POST /sparql  application/sparql-query (the query as body)
+# The data are loaded once into a query.Store; results are cached by
+# normalized query text and Accept header, and both the store and the cache
+# are dropped as soon as one of the source files is rebuilt.
+SCREENPLAY_FILE = xml_to_rdf.TTL_FILE
+WATCHED_FILES = [query.SNAPSHOT_FILE, query.TURTLE_FILE, SCREENPLAY_FILE]
+
+# Media type → rdflib serialization format
+RESULT_FORMATS = {
+    "application/sparql-results+json": "json",
+    "application/sparql-results+xml": "xml",
+    "text/csv": "csv",
+    "text/tab-separated-values": "tsv",
+}
+ASK_FORMATS = {
+    "application/sparql-results+json": "json",
+    "application/sparql-results+xml": "xml",
+}
+GRAPH_FORMATS = {
+    "text/turtle": "turtle",
+    "application/n-triples": "nt",
+    "application/rdf+xml": "xml",
+    "application/ld+json": "json-ld",
+}
+
+# Strings and IRIs are kept as they are; comments and whitespace are dropped
+# around brackets and separators and collapsed to a single space elsewhere
+_SPACE = r"(?:\s|#[^\n]*)"
+_QUERY_TOKENS = re.compile(
+    r'(?P<literal>"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\'|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+    r'|<[^<>"{}|^`\\\s]*>)'
+    rf"|{_SPACE}*(?P<punct>[{{}}(),;]){_SPACE}*|{_SPACE}+"
+)
+
+
+def normalize_query(text):
+    return _QUERY_TOKENS.sub(lambda m: m.group("literal") or m.group("punct") or " ", text).strip()
+
+
+# Preferred media type of an Accept header among the supported ones
+def negotiate(accept, formats):
+    default = next(iter(formats))
+    ranked = []
+    for position, item in enumerate((accept or "").split(",")):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        ranked.append((-q, position, media_type.lower()))
+    for q, _, media_type in sorted(ranked):
+        if q == 0:
+            break
+        if media_type in formats:
+            return media_type
+        if media_type in ("*/*", "application/*"):
+            return default
+    return default
+
+
+# A query that does not parse (the client's fault, unlike any other failure)
+class QueryError(ValueError):
+    pass
+
+
+class LRUCache:
+    def __init__(self, size=256):
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class Endpoint:
+
+    def __init__(self, cache_size=256):
+        self.cache = LRUCache(cache_size)
+        self.lock = threading.Lock()
+        self.signature = None
+        self._store = None
+
+    # Size and modification time of the source files: a rebuild changes it
+    def _signature(self):
+        return tuple(
+            (f.name, f.stat().st_mtime_ns, f.stat().st_size) if f.is_file() else (f.name, None, None)
+            for f in WATCHED_FILES
+        )
+
+    def store(self):
+        signature = self._signature()
+        if signature != self.signature:
+            with self.lock:
+                if signature != self.signature:
+                    sources = [query.dataset_file()] + ([SCREENPLAY_FILE] if SCREENPLAY_FILE.is_file() else [])
+                    # The interned terms of the previous store would otherwise
+                    # pile up with every rebuild
+                    terms.clear()
+                    self._store = query.load(*sources)
+                    self.cache.clear()
+                    query.clear_prepared()
+                    self.signature = signature
+        return self._store
+
+    def run(self, sparql, accept):
+        store = self.store()
+        sparql = normalize_query(sparql)
+        key = (sparql, accept or "")
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached, True
+
+        try:
+            query.prepare(sparql, store.namespaces)
+        except Exception as e:
+            raise QueryError(str(e)) from e
+        result = store.execute(sparql)
+        if result.type == "SELECT":
+            formats = RESULT_FORMATS
+        elif result.type == "ASK":
+            formats = ASK_FORMATS
+        else:
+            formats = GRAPH_FORMATS
+        media_type = negotiate(accept, formats)
+        body = result.serialize(format=formats[media_type])
+        response = (media_type, body if isinstance(body, bytes) else body.encode("utf-8"))
+        self.cache.put(key, response)
+        return response, False
+
+    def __call__(self, environ, start_response):
+        headers = [("Access-Control-Allow-Origin", "*")]
+
+        def respond(status, content_type, body, extra=()):
+            start_response(status, headers + [("Content-Type", content_type),
+                                              ("Content-Length", str(len(body)))] + list(extra))
+            return [body]
+
+        def error(status, message):
+            return respond(status, "text/plain; charset=utf-8", message.encode("utf-8"))
+
+        if environ.get("PATH_INFO", "/").rstrip("/") not in ("", "/sparql"):
+            return error("404 Not Found", "Not found: use /sparql")
+
+        method = environ["REQUEST_METHOD"]
+        if method == "OPTIONS":
+            return respond("204 No Content", "text/plain", b"", [
+                ("Access-Control-Allow-Methods", "GET, POST, OPTIONS"),
+                ("Access-Control-Allow-Headers", "Accept, Content-Type"),
+            ])
+
+        params = parse_qs(environ.get("QUERY_STRING", ""))
+        if method == "POST":
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+            body = environ["wsgi.input"].read(length).decode("utf-8")
+            content_type = environ.get("CONTENT_TYPE", "").split(";")[0].strip().lower()
+            if content_type == "application/sparql-query":
+                params["query"] = [body]
+            elif content_type == "application/x-www-form-urlencoded":
+                params.update(parse_qs(body))
+            else:
+                return error("415 Unsupported Media Type", f"Unsupported content type: {content_type}")
+        elif method != "GET":
+            start_response("405 Method Not Allowed", headers + [("Allow", "GET, POST, OPTIONS")])
+            return [b""]
+
+        queries = params.get("query", [])
+        if len(queries) != 1:
+            return error("400 Bad Request", "Exactly one 'query' parameter is required")
+
+        try:
+            (media_type, body), hit = self.run(queries[0], environ.get("HTTP_ACCEPT"))
+        except QueryError as e:
+            return error("400 Bad Request", f"Malformed query: {e}")
+        except Exception as e:
+            return error("500 Internal Server Error", f"Query failed: {e}")
+        return respond("200 OK", f"{media_type}; charset=utf-8", body, [("X-Cache", "HIT" if hit else "MISS")])
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+def main(host="127.0.0.1", port=8000, cache_size=256):
+    endpoint = Endpoint(cache_size)
+    store = endpoint.store()
+    with make_server(host, port, endpoint, server_class=ThreadingWSGIServer) as server:
+        print(f"SPARQL endpoint on http://{host}:{port}/sparql ({len(store)} triples)")
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the merged dataset and the TEI screenplay as a SPARQL endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--cache-size", type=int, default=256, help="number of cached query results")
+    args = parser.parse_args()
+    try:
+        main(args.host, args.port, args.cache_size)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,74 @@
+from rdflib import BNode, Dataset, Graph, Literal, URIRef
+
+# TERM INTERNING
+# One canonical object per RDF term, keyed by (kind, value, datatype, lang):
+# entities shared by many items (rrr:renzi_collection, rrr:bologna...) and
+# repeated literals are allocated once per process and can be compared by
+# identity. Every conversion and merge step builds its terms through here.
+IRI, BNODE, LITERAL = "iri", "bnode", "literal"
+
+_terms = {}
+
+
+def key(term):
+    if isinstance(term, Literal):
+        return (LITERAL, str(term), term.datatype, term.language)
+    if isinstance(term, BNode):
+        return (BNODE, str(term), None, None)
+    return (IRI, str(term), None, None)
+
+
+# Canonical object for an existing term
+def intern(term):
+    return _terms.setdefault(key(term), term)
+
+
+def iri(value):
+    term = _terms.get((IRI, value, None, None))
+    if term is None:
+        term = _terms[(IRI, value, None, None)] = URIRef(value)
+    return term
+
+
+def literal(value, datatype=None, lang=None):
+    k = (LITERAL, value, datatype, lang)
+    term = _terms.get(k)
+    if term is None:
+        term = Literal(value, datatype=datatype, lang=lang)
+        # The constructor may normalise the lexical form or the language tag:
+        # share the object with any term already interned under its own key
+        term = _terms[k] = _terms.setdefault(key(term), term)
+    return term
+
+
+def intern_triples(triples):
+    for s, p, o in triples:
+        yield intern(s), intern(p), intern(o)
+
+
+# Parses an RDF source in a scratch graph and adds its interned triples to g
+def parse(g, source=None, data=None, format="turtle"):
+    # An N-Quads source is read as a dataset and added as the union of its graphs
+    scratch = Dataset(default_union=True) if format == "nquads" else Graph()
+    scratch.parse(source=source, data=data, format=format)
+    g.addN(triple + (g,) for triple in intern_triples(scratch.triples((None, None, None))))
+    return g
+
+
+# Same for an N-Quads source: every graph is added to the matching named graph of ds
+def parse_quads(ds, source):
+    scratch = Dataset()
+    scratch.parse(source=source, format="nquads")
+    for graph in scratch.graphs():
+        target = ds.graph(graph.identifier)
+        target.addN(triple + (target,) for triple in intern_triples(graph))
+    return ds
+
+
+# Number of distinct terms interned so far
+def size():
+    return len(_terms)
+
+
+def clear():
+    _terms.clear()
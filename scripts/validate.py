@@ -0,0 +1,250 @@
+import argparse
+from collections import namedtuple
+import re
+import sys
+from rdflib import Literal, RDF, URIRef
+
+import dates
+import jsonld_export
+from mapping import expand
+
+# SHAPES
+# SHACL-style node shapes, declared like the mapping specs:
+#   name        label of the shape in the report
+#   target      CURIE of the class whose instances are checked
+#   where       optional (predicate, value) the instance must also have
+#   properties  (predicate, constraints) where constraints may set
+#               min / max   cardinality
+#               kind        "iri", "literal" or "node" (IRI or blank node)
+#               datatype    CURIE or list of CURIEs of the allowed datatypes
+# compile_shape() turns each of them once into a function checking one focus
+# node; validate() runs them all in a single pass over the graph.
+DATE_TYPES = ["xsd:date", "xsd:gYear", "xsd:gYearMonth", "xsd:dateTime", str(dates.EDTF)]
+
+SHAPES = [
+    {
+        "name": "Photograph",
+        "target": "schema:Photograph",
+        "properties": [
+            ("dcterms:title", {"min": 1, "kind": "literal"}),
+            ("dcterms:created", {"max": 1, "datatype": DATE_TYPES}),
+            ("schema:dateCreated", {"max": 1, "datatype": DATE_TYPES}),
+            ("foaf:depicts", {"kind": "iri"}),
+            ("dcterms:isPartOf", {"kind": "iri"}),
+        ],
+    },
+    {
+        "name": "Movie",
+        "target": "schema:Movie",
+        "properties": [
+            ("dcterms:title", {"min": 1, "kind": "literal"}),
+            ("dcterms:issued", {"datatype": DATE_TYPES}),
+            ("schema:director", {"kind": "iri"}),
+            ("dcterms:creator", {"kind": "iri"}),
+            ("schema:musicBy", {"kind": "iri"}),
+        ],
+    },
+    {
+        "name": "Book",
+        "target": "schema:Book",
+        "properties": [
+            ("dcterms:title", {"min": 1, "max": 1, "kind": "literal"}),
+            ("dcterms:issued", {"max": 1, "datatype": DATE_TYPES}),
+            ("schema:author", {"kind": "iri"}),
+            ("schema:numberOfPages", {"max": 1, "datatype": "xsd:integer"}),
+        ],
+    },
+    {
+        "name": "Library",
+        "target": "schema:Library",
+        "properties": [
+            ("schema:name", {"min": 1, "kind": "literal"}),
+            ("schema:geo", {"max": 1, "kind": "node"}),
+            ("schema:seatingCapacity", {"max": 1, "datatype": "xsd:integer"}),
+            ("schema:isAccessibleForFree", {"max": 1, "datatype": "xsd:boolean"}),
+            ("schema:foundingDate", {"max": 1, "datatype": DATE_TYPES}),
+            ("schema:dateCreated", {"max": 1, "datatype": DATE_TYPES}),
+            ("schema:addressLocality", {"kind": "iri"}),
+        ],
+    },
+    {
+        # Archival descriptions (ISAD(G)) of single letters
+        "name": "Archival letter",
+        "target": "schema:CreativeWork",
+        "where": ("dcterms:conformsTo", "ISAD(G)"),
+        "properties": [
+            ("dcterms:title", {"min": 1, "kind": "literal"}),
+            ("dcterms:created", {"min": 1, "max": 1, "datatype": DATE_TYPES}),
+            ("dcterms:creator", {"min": 1, "kind": "iri"}),
+            ("schema:numberOfPages", {"max": 1, "datatype": "xsd:integer"}),
+            ("schema:associatedMedia", {"kind": "iri"}),
+        ],
+    },
+]
+
+# LEXICAL FORMS
+# Checked on every typed literal of the graph, whatever its subject
+_TZ = r"(?:Z|[+-](?:0\d|1[0-4]):[0-5]\d)?"
+_YEAR = r"-?(?:[1-9]\d{4,}|\d{4})"
+_MONTH = r"(?:0[1-9]|1[0-2])"
+_DAY = r"(?:0[1-9]|[12]\d|3[01])"
+_EDTF_DATE = rf"(?:\d{{3}}[\dX]|\d{{4}}-{_MONTH}(?:-{_DAY})?)[?~%]?"
+LEXICAL_FORMS = {
+    expand(datatype): re.compile(pattern + r"\Z")
+    for datatype, pattern in {
+        "xsd:date": rf"{_YEAR}-{_MONTH}-{_DAY}{_TZ}",
+        "xsd:dateTime": rf"{_YEAR}-{_MONTH}-{_DAY}T(?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d(?:\.\d+)?{_TZ}",
+        "xsd:gYear": rf"{_YEAR}{_TZ}",
+        "xsd:gYearMonth": rf"{_YEAR}-{_MONTH}{_TZ}",
+        "xsd:integer": r"[+-]?\d+",
+        "xsd:nonNegativeInteger": r"\+?\d+",
+        "xsd:decimal": r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)",
+        "xsd:double": r"[+-]?(?:(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?|INF|NaN)|-INF",
+        "xsd:boolean": r"true|false|1|0",
+        "xsd:anyURI": r"\S*",
+        # Approximate, uncertain and decade dates and ranges, as made by dates.py
+        str(dates.EDTF): rf"{_EDTF_DATE}(?:/{_EDTF_DATE})?",
+    }.items()
+}
+
+# Absolute IRI: a scheme and no character forbidden in IRIs
+_IRI = re.compile(r'[A-Za-z][A-Za-z0-9+.\-]*:[^\s<>"{}|\\^`]*\Z')
+
+Violation = namedtuple("Violation", "focus path value message")
+
+
+def _describe(term):
+    if isinstance(term, Literal):
+        datatype = f"^^{jsonld_export.compact_iri(term.datatype)}" if term.datatype else ""
+        return f'"{term}"{datatype}'
+    return jsonld_export.compact_iri(term)
+
+
+def _datatype_names(datatypes):
+    return " | ".join(jsonld_export.compact_iri(d) for d in datatypes)
+
+
+def _compile_property(predicate, constraints):
+    p = expand(predicate)
+    low, high = constraints.get("min", 0), constraints.get("max")
+    kind = constraints.get("kind")
+    datatypes = constraints.get("datatype")
+    if isinstance(datatypes, str):
+        datatypes = [datatypes]
+    datatypes = [expand(d) for d in datatypes] if datatypes else None
+    if datatypes:
+        kind = "literal"
+
+    def check(focus, properties, name):
+        values = properties.get(p, ())
+        if len(values) < low:
+            yield Violation(focus, p, None, f"{name}: at least {low} value(s) required, found {len(values)}")
+        if high is not None and len(values) > high:
+            yield Violation(focus, p, None, f"{name}: at most {high} value(s) allowed, found {len(values)}")
+        for value in values:
+            if kind == "iri" and not isinstance(value, URIRef):
+                yield Violation(focus, p, value, f"{name}: IRI expected")
+            elif kind == "node" and isinstance(value, Literal):
+                yield Violation(focus, p, value, f"{name}: IRI or blank node expected, not a literal")
+            elif kind == "literal" and not isinstance(value, Literal):
+                yield Violation(focus, p, value, f"{name}: literal expected")
+            elif datatypes and value.datatype not in datatypes:
+                yield Violation(focus, p, value, f"{name}: datatype {_datatype_names(datatypes)} expected")
+
+    return p, check
+
+
+def compile_shape(spec):
+    target = expand(spec["target"])
+    where = None
+    if spec.get("where"):
+        where_p, where_value = spec["where"]
+        where = expand(where_p), where_value
+    compiled = [_compile_property(*prop) for prop in spec.get("properties", [])]
+    checks = [check for _, check in compiled]
+    name = spec["name"]
+
+    def check(focus, properties):
+        if where and not any(str(v) == where[1] for v in properties.get(where[0], ())):
+            return
+        for check_property in checks:
+            yield from check_property(focus, properties, name)
+
+    # Predicates whose values the shape needs
+    watched = {p for p, _ in compiled} | ({where[0]} if where else set())
+    return target, watched, check
+
+
+# Checks of a single term, wherever it appears
+def check_term(focus, p, term):
+    if isinstance(term, URIRef):
+        if not _IRI.match(term):
+            yield Violation(focus, p, term, "malformed IRI")
+    elif isinstance(term, Literal) and term.datatype is not None:
+        if not _IRI.match(term.datatype):
+            yield Violation(focus, p, term, "malformed datatype IRI")
+        pattern = LEXICAL_FORMS.get(term.datatype)
+        if pattern is not None and not pattern.match(term):
+            yield Violation(focus, p, term, f"invalid lexical form for {jsonld_export.compact_iri(term.datatype)}")
+
+
+# Validates g in one pass: every term is checked as it is read (once, if it
+# is valid), and the values of the predicates some shape needs are indexed by
+# subject; then each node is checked against the shapes of its classes.
+# Returns all the violations.
+def validate(g, shapes=SHAPES):
+    by_class = {}
+    watched = {RDF.type}
+    for spec in shapes:
+        target, predicates, check = compile_shape(spec)
+        by_class.setdefault(target, []).append(check)
+        watched |= predicates
+
+    violations = []
+    index = {}
+    valid = set()
+    for s, p, o in g.triples((None, None, None)):
+        for term in (s, p, o):
+            if term not in valid:
+                found = list(check_term(s, p, term))
+                if found:
+                    violations.extend(found)
+                else:
+                    valid.add(term)
+        if p in watched:
+            index.setdefault(s, {}).setdefault(p, []).append(o)
+
+    for focus in sorted(index, key=str):
+        properties = index[focus]
+        for rdf_type in properties.get(RDF.type, ()):
+            for check in by_class.get(rdf_type, ()):
+                violations.extend(check(focus, properties))
+    return violations
+
+
+def format_report(violations):
+    lines = []
+    for v in sorted(violations, key=lambda v: (str(v.focus), str(v.path), v.message)):
+        value = f" {_describe(v.value)}" if v.value is not None else ""
+        lines.append(f"{_describe(v.focus)} {_describe(v.path)}{value}: {v.message}")
+    return "\n".join(lines)
+
+
+def report(violations):
+    if violations:
+        print(format_report(violations))
+        print(f"{len(violations)} violation(s)")
+    else:
+        print("No violations")
+    return violations
+
+
+def main(source=None):
+    return report(validate(jsonld_export.load_graph(source)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate the merged dataset against the project shapes.")
+    parser.add_argument("source", nargs="?", help="Turtle file or snapshot to validate (default: the merged dataset)")
+    args = parser.parse_args()
+    sys.exit(1 if main(args.source) else 0)
@@ -1,29 +1,195 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import glob
+import os
+import threading
 from lxml import etree
 from pathlib import Path
 
-XML_FILE = Path("lastrada.xml")
-XSL_FILE = Path("tei2html_lastrada.xsl")
-OUT_FILE = Path("lastrada.html")
+# Locate directories
+script_path = Path(__file__).resolve()
+tei_dir = script_path.parents[1] / "tei_xslt"
+html_dir = script_path.parents[1] / "html"
 
-def main():
+XML_FILE = tei_dir / "lastrada.xml"
+XSL_FILE = tei_dir / "tei2html_lastrada.xsl"
+# The published edition (html/lastrada.html) is styled by hand: the raw XSLT
+# output goes to a separate, non-versioned file
+OUT_FILE = html_dir / "lastrada.generated.html"
 
-    if not XML_FILE.exists():
-        raise FileNotFoundError(f"XML file not found: {XML_FILE}")
+# TEI names used to cut the document into scene pages
+tei_ns = {"tei": "http://www.tei-c.org/ns/1.0"}
+XML_ID = "{http://www.w3.org/XML/1998/namespace}id"
+PB = "{http://www.tei-c.org/ns/1.0}pb"
+_scenes = etree.XPath("/tei:TEI/tei:text//tei:div[@type='scene']", namespaces=tei_ns)
 
-    if not XSL_FILE.exists():
-        raise FileNotFoundError(f"XSL file not found: {XSL_FILE}")
+# Compiled stylesheets, keyed by path and recompiled only when the file changes
+_transforms = {}
+_transforms_lock = threading.Lock()
 
-    xml = etree.parse(str(XML_FILE))
-    xsl = etree.parse(str(XSL_FILE))
-    transform = etree.XSLT(xsl)
 
-    result = transform(xml)
+def get_transform(xsl_file=XSL_FILE):
+    xsl_file = Path(xsl_file).resolve()
+    if not xsl_file.exists():
+        raise FileNotFoundError(f"XSL file not found: {xsl_file}")
 
-    OUT_FILE.write_bytes(
-        etree.tostring(result, encoding="utf-8", pretty_print=True)
-    )
+    mtime = xsl_file.stat().st_mtime_ns
+    with _transforms_lock:
+        cached = _transforms.get(xsl_file)
+        if cached is None or cached[0] != mtime:
+            cached = _transforms[xsl_file] = (mtime, etree.XSLT(etree.parse(str(xsl_file))))
+    return cached[1]
+
+
+def _parse(xml_file):
+    if not Path(xml_file).exists():
+        raise FileNotFoundError(f"XML file not found: {xml_file}")
+    return etree.parse(str(xml_file))
+
+
+def _transform(doc, xsl_file=XSL_FILE, **params):
+    params = {name: etree.XSLT.strparam(value) for name, value in params.items()}
+    result = get_transform(xsl_file)(doc, **params)
+    return etree.tostring(result, encoding="utf-8", pretty_print=True)
+
+
+# Renders one TEI document to HTML bytes
+def render(xml_file=XML_FILE, xsl_file=XSL_FILE):
+    return _transform(_parse(xml_file), xsl_file)
+
+
+# Writes data to path unless the file already holds exactly these bytes
+def write_if_changed(path, data):
+    path = Path(path)
+    if path.is_file() and path.stat().st_size == len(data) and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+def render_to_file(xml_file=XML_FILE, out_file=OUT_FILE, xsl_file=XSL_FILE):
+    return write_if_changed(out_file, render(xml_file, xsl_file))
+
+
+# PAGINATED EDITION
+# One page per div[@type='scene'] plus an index page, in html/<document name>/.
+# Each scene is rendered from a small document holding the teiHeader, the page
+# breaks just before the scene and the scene itself, so the cost of a page
+# does not grow with the length of the screenplay.
+def page_name(div, position):
+    # Must match the "page-name" template of the stylesheet
+    return f"{div.get(XML_ID)}.html" if div.get(XML_ID) else f"scene-{position}.html"
+
+
+def _scene_document(root, div):
+    page = etree.Element(root.tag, dict(root.attrib), nsmap=root.nsmap)
+    header = root.find("tei:teiHeader", tei_ns)
+    if header is not None:
+        page.append(copy.deepcopy(header))
+
+    text = root.find("tei:text", tei_ns)
+    text = etree.SubElement(page, text.tag, dict(text.attrib))
+    body = etree.SubElement(text, "{%s}body" % tei_ns["tei"])
+
+    # Page breaks right before the scene, so its first page number is shown
+    breaks = []
+    for sibling in div.itersiblings(preceding=True):
+        if sibling.tag == PB:
+            breaks.append(sibling)
+        elif isinstance(sibling.tag, str):
+            break
+    for pb in reversed(breaks):
+        pb = copy.deepcopy(pb)
+        pb.tail = None
+        body.append(pb)
+
+    scene = copy.deepcopy(div)
+    scene.tail = None
+    body.append(scene)
+    return etree.ElementTree(page)
+
+
+def render_pages(xml_file=XML_FILE, out_dir=None, xsl_file=XSL_FILE):
+    xml_file = Path(xml_file)
+    out_dir = Path(out_dir) if out_dir else html_dir / xml_file.stem
+    doc = _parse(xml_file)
+    root = doc.getroot()
+    scenes = _scenes(doc)
+    names = [page_name(div, position) for position, div in enumerate(scenes, 1)]
+
+    written = []
+    index_file = out_dir / "index.html"
+    if write_if_changed(index_file, _transform(doc, xsl_file, page="index")):
+        written.append(index_file)
+
+    for i, div in enumerate(scenes):
+        data = _transform(
+            _scene_document(root, div), xsl_file,
+            page="scene",
+            prev=names[i - 1] if i > 0 else "",
+            next=names[i + 1] if i + 1 < len(names) else "",
+        )
+        if write_if_changed(out_dir / names[i], data):
+            written.append(out_dir / names[i])
+    return written
+
+
+# BATCH RENDERING
+def collect_xml_files(paths):
+    files = []
+    for path in paths:
+        if Path(path).is_dir():
+            files.extend(sorted(Path(path).glob("*.xml")))
+        else:
+            files.extend(sorted(Path(f) for f in glob.glob(str(path))))
+    return files
+
+
+# Renders every document to out_dir/<name>.html (or, with pages=True, to the
+# scene pages in out_dir/<name>/) through a thread pool: lxml releases the GIL
+# while transforming, and the stylesheet is compiled once.
+# Returns the files that were (re)written.
+def render_batch(xml_files, out_dir=html_dir, xsl_file=XSL_FILE, jobs=0, pages=False):
+    xml_files = [Path(f) for f in xml_files]
+    get_transform(xsl_file)
+
+    def render_one(xml_file):
+        if pages:
+            return render_pages(xml_file, Path(out_dir) / xml_file.stem, xsl_file)
+        out_file = Path(out_dir) / (xml_file.stem + ".html")
+        return [out_file] if render_to_file(xml_file, out_file, xsl_file) else []
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        return [f for written in pool.map(render_one, xml_files) for f in written]
+
+
+def main(pages=False):
+    if pages:
+        written = render_pages(XML_FILE)
+        print(f"{len(written)} pages written to {html_dir / XML_FILE.stem}")
+    elif render_to_file(XML_FILE, OUT_FILE, XSL_FILE):
+        print(f"HTML successfully written to {OUT_FILE}")
+    else:
+        print(f"HTML is up to date: {OUT_FILE}")
 
-    print(f"HTML successfully written to {OUT_FILE}")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Render TEI documents to HTML with the project stylesheet.")
+    parser.add_argument("paths", nargs="*", metavar="PATH",
+                        help="TEI files, folders or glob patterns to render (default: tei_xslt/lastrada.xml)")
+    parser.add_argument("--out-dir", default=str(html_dir),
+                        help="folder of the rendered pages (default: html/)")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="number of rendering threads (default: one per CPU)")
+    parser.add_argument("--pages", action="store_true",
+                        help="one page per scene plus an index, in <out-dir>/<document name>/")
+    args = parser.parse_args()
+
+    if args.paths:
+        files = collect_xml_files(args.paths)
+        written = render_batch(files, args.out_dir, XSL_FILE, args.jobs, args.pages)
+        print(f"{len(files)} documents rendered, {len(written)} HTML files written to {args.out_dir}")
+    else:
+        main(args.pages)
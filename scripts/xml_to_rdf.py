@@ -1,6 +1,14 @@
-import xml.etree.ElementTree as ET
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import glob
+import os
+from pathlib import Path
+from lxml import etree
 from rdflib import Namespace, Graph, RDF, URIRef, Literal, XSD
 
+import rdf_output
+
 # NAMESPACES
 rrr = Namespace("https://github.com/CineFiles25/TheRevolussionOfRenzoRenzi/")
 schema = Namespace("https://schema.org/")
@@ -14,60 +22,116 @@ owl = Namespace("http://www.w3.org/2002/07/owl#")
 tei_ns = {'tei': 'http://www.tei-c.org/ns/1.0'}
 xml_ns = '{http://www.w3.org/XML/1998/namespace}'
 
-# GRAPH
-g = Graph()
-
-g.bind("rrr", rrr)
-g.bind("schema", schema)
-g.bind("dcterms", dcterms)
-g.bind("dc", dc)
-g.bind("foaf", foaf)
-g.bind("crm", crm)
-g.bind("owl", owl)
-
-# MAIN ENTITY
-screenplay = URIRef(rrr + "lastrada_screenplay_seq1")
-
-# LOAD XML
-tree = ET.parse("../../tei_xslt/lastrada.xml")
-root = tree.getroot()
-
-# RESOURCE TYPE
-g.add((screenplay, RDF.type, schema.CreativeWork))
-g.add((screenplay, dcterms.title, Literal("La strada — Sequenza I", lang="it")))
-
-# AUTHOR
-author = root.find(".//tei:author", tei_ns)
-if author is not None and author.text:
-    g.add((screenplay, schema.author, Literal(author.text, lang="it")))
-
-# EDITOR
-editor = root.find(".//tei:editor", tei_ns)
-if editor is not None and editor.text:
-    g.add((screenplay, schema.editor, Literal(editor.text, lang="it")))
-
-# PUBLISHER
-publisher = root.find(".//tei:publisher", tei_ns)
-if publisher is not None and publisher.text:
-    g.add((screenplay, dcterms.publisher, Literal(publisher.text, lang="it")))
-
-# PUBLICATION DATE
-date = root.find(".//tei:date[@when]", tei_ns)
-if date is not None:
-    g.add((screenplay, dcterms.issued, Literal(date.get("when"), datatype=XSD.gYear)))
-
-# LANGUAGE
-lang = root.find(".//tei:language[@ident]", tei_ns)
-if lang is not None:
-    g.add((screenplay, dcterms.language, Literal(lang.get("ident"))))
+# TEI element names (Clark notation), compared against the tags while walking
+_tei = "{" + tei_ns["tei"] + "}"
+TEI = _tei + "TEI"
+TEI_HEADER = _tei + "teiHeader"
+FILE_DESC = _tei + "fileDesc"
+PERSON = _tei + "person"
+PLACE = _tei + "place"
+DIV = _tei + "div"
+HEAD = _tei + "head"
+STAGE = _tei + "stage"
+P = _tei + "p"
+SP = _tei + "sp"
+SPEAKER = _tei + "speaker"
+
+# Compiled XPath queries
+_string_value = etree.XPath("string()", smart_strings=False)
+speech_directions = etree.XPath(".//tei:stage[@type='direction']", namespaces=tei_ns)
+
+# Locate directories
+script_path = Path(__file__).resolve()
+tei_dir = script_path.parents[1] / "tei_xslt"
+
+XML_FILE = tei_dir / "lastrada.xml"
+TTL_FILE = tei_dir / "lastrada_screenplay.ttl"
+RDF_FILE = tei_dir / "lastrada_screenplay.rdf"
+
+
+def new_graph():
+    g = Graph()
+
+    g.bind("rrr", rrr)
+    g.bind("schema", schema)
+    g.bind("dcterms", dcterms)
+    g.bind("dc", dc)
+    g.bind("foaf", foaf)
+    g.bind("crm", crm)
+    g.bind("owl", owl)
+    return g
+
+
+# DOCUMENT IDENTIFIER
+# Taken from the teiHeader (publicationStmt/idno), else from the xml:id of the
+# TEI element, else from the file name
+def document_id(root, xml_file=XML_FILE):
+    idno = root.find(".//tei:fileDesc/tei:publicationStmt/tei:idno", tei_ns)
+    if idno is not None and idno.text and idno.text.strip():
+        return idno.text.strip()
+    return root.get(f"{xml_ns}id") or Path(xml_file).stem
+
+
+def screenplay_uri(doc_id):
+    return URIRef(rrr + doc_id)
+
+
+# Base of the local IRIs of a document (scenes, paragraphs, speeches,
+# characters, actors, places): rrr:<document id>/, so that the documents of a
+# corpus sharing xml:ids do not collide. The project screenplay keeps its
+# unscoped IRIs (rrr:scene_seq1...), which predate corpus mode and are used by
+# the search index.
+UNSCOPED_DOCUMENTS = {"lastrada_screenplay_seq1"}
+
+
+def document_base(doc_id):
+    return str(rrr) if doc_id in UNSCOPED_DOCUMENTS else f"{rrr}{doc_id}/"
+
+
+# DOCUMENT METADATA (from the teiHeader)
+def header_to_rdf(g, screenplay, header):
+    # RESOURCE TYPE
+    g.add((screenplay, RDF.type, schema.CreativeWork))
+
+    # TITLE
+    title = header.find(".//tei:titleStmt/tei:title", tei_ns)
+    if title is not None and title.text:
+        g.add((screenplay, dcterms.title, Literal(title.text, lang="it")))
+
+    # AUTHOR
+    author = header.find(".//tei:author", tei_ns)
+    if author is not None and author.text:
+        g.add((screenplay, schema.author, Literal(author.text, lang="it")))
+
+    # EDITOR
+    editor = header.find(".//tei:editor", tei_ns)
+    if editor is not None and editor.text:
+        g.add((screenplay, schema.editor, Literal(editor.text, lang="it")))
+
+    # PUBLISHER
+    publisher = header.find(".//tei:publisher", tei_ns)
+    if publisher is not None and publisher.text:
+        g.add((screenplay, dcterms.publisher, Literal(publisher.text, lang="it")))
+
+    # PUBLICATION DATE
+    date = header.find(".//tei:date[@when]", tei_ns)
+    if date is not None:
+        g.add((screenplay, dcterms.issued, Literal(date.get("when"), datatype=XSD.gYear)))
+
+    # LANGUAGE
+    lang = header.find(".//tei:language[@ident]", tei_ns)
+    if lang is not None:
+        g.add((screenplay, dcterms.language, Literal(lang.get("ident"))))
+    return g
+
 
 # PERSONS (characters + actors)
-for person in root.findall(".//tei:person", tei_ns):
+def person_to_rdf(g, screenplay, person, base=rrr):
     person_id = person.get(f"{xml_ns}id")
     if not person_id:
-        continue
+        return g
 
-    character_uri = URIRef(rrr + f"character_{person_id}")
+    character_uri = URIRef(base + f"character_{person_id}")
     g.add((character_uri, RDF.type, foaf.Person))
     g.add((screenplay, schema.character, character_uri))
 
@@ -79,7 +143,7 @@ for person in root.findall(".//tei:person", tei_ns):
     # Actor
     actor_name = person.find(".//tei:persName[@type='actor']", tei_ns)
     if actor_name is not None and actor_name.text:
-        actor_uri = URIRef(rrr + f"actor_{person_id}")
+        actor_uri = URIRef(base + f"actor_{person_id}")
         g.add((actor_uri, RDF.type, foaf.Person))
         g.add((actor_uri, foaf.name, Literal(actor_name.text)))
         g.add((character_uri, schema.actor, actor_uri))
@@ -88,103 +152,316 @@ for person in root.findall(".//tei:person", tei_ns):
         viaf_ref = actor_name.get("ref")
         if viaf_ref:
             g.add((actor_uri, owl.sameAs, URIRef(viaf_ref)))
+    return g
+
 
 # PLACES
-for place in root.findall(".//tei:place", tei_ns):
+def place_to_rdf(g, place, base=rrr):
     place_id = place.get(f"{xml_ns}id")
     if not place_id:
-        continue
+        return g
 
-    place_uri = URIRef(rrr + f"place_{place_id}")
+    place_uri = URIRef(base + f"place_{place_id}")
     g.add((place_uri, RDF.type, schema.Place))
 
     place_name = place.find(".//tei:placeName", tei_ns)
     if place_name is not None and place_name.text:
         g.add((place_uri, schema.name, Literal(place_name.text, lang="it")))
+    return g
+
 
 # SCENES
-scene_counter = 0
+def node_text(elem):
+    # String value of a node (text of nested elements included), stripped
+    return _string_value(elem).strip()
 
-for div in root.findall(".//tei:div[@type='scene']", tei_ns):
-    scene_counter += 1
+
+def scene_to_rdf(g, screenplay, div, scene_counter, base=rrr):
     scene_id = div.get(f"{xml_ns}id") or f"scene_{scene_counter}"
     scene_num = div.get("n", str(scene_counter))
 
-    scene_uri = URIRef(rrr + f"scene_{scene_id}")
+    scene_uri = URIRef(base + f"scene_{scene_id}")
     g.add((scene_uri, RDF.type, schema.CreativeWork))
     g.add((scene_uri, schema.isPartOf, screenplay))
     g.add((scene_uri, schema.position, Literal(scene_num, datatype=XSD.integer)))
 
-    # Scene headings
-    for head in div.findall("tei:head", tei_ns):
-        if head.text:
-            if head.get("type") == "logline":
-                g.add((scene_uri, dcterms.abstract, Literal(head.text, lang="it")))
-            else:
-                g.add((scene_uri, dcterms.title, Literal(head.text, lang="it")))
-
-    # Stage directions (settings)
-    for stage in div.findall("tei:stage[@type='setting']", tei_ns):
-        setting_text = "".join(stage.itertext()).strip()
-        if setting_text:
-            g.add((scene_uri, dcterms.abstract, Literal(setting_text, lang="it")))
-
-        where_ref = stage.get("where")
-        if where_ref:
-            place_ref = where_ref.replace("#", "")
-            place_uri = URIRef(rrr + f"place_{place_ref}")
-            g.add((scene_uri, schema.location, place_uri))
-
-    # Paragraphs
+    # Single pass over the children of the scene, dispatching on tag and type
     para_counter = 0
-    for para in div.findall("tei:p", tei_ns):
-        para_counter += 1
-        para_text = "".join(para.itertext()).strip()
-        if para_text:
-            para_uri = URIRef(rrr + f"{scene_id}_para_{para_counter}")
-            g.add((para_uri, RDF.type, schema.Text))
-            g.add((para_uri, schema.isPartOf, scene_uri))
-            g.add((para_uri, schema.text, Literal(para_text, lang="it")))
-            g.add((para_uri, schema.position, Literal(para_counter, datatype=XSD.integer)))
-
-    # Speeches
     speech_counter = 0
-    for sp in div.findall("tei:sp", tei_ns):
-        speech_counter += 1
-        speaker_ref = sp.get("who")
-
-        speech_uri = URIRef(rrr + f"{scene_id}_speech_{speech_counter}")
-        g.add((speech_uri, RDF.type, schema.Text))
-        g.add((speech_uri, schema.isPartOf, scene_uri))
-        g.add((speech_uri, schema.position, Literal(speech_counter, datatype=XSD.integer)))
-
-        if speaker_ref:
-            character_id = speaker_ref.replace("#", "")
-            character_uri = URIRef(rrr + f"character_{character_id}")
-            g.add((speech_uri, schema.character, character_uri))
-
-        speaker_elem = sp.find("tei:speaker", tei_ns)
-        if speaker_elem is not None and speaker_elem.text:
-            g.add((speech_uri, schema.name, Literal(speaker_elem.text, lang="it")))
-
-        for p in sp.findall("tei:p", tei_ns):
-            dialog_text = "".join(p.itertext()).strip()
+    for child in div:
+        tag = child.tag
+
+        # Scene headings
+        if tag == HEAD:
+            if child.text:
+                if child.get("type") == "logline":
+                    g.add((scene_uri, dcterms.abstract, Literal(child.text, lang="it")))
+                else:
+                    g.add((scene_uri, dcterms.title, Literal(child.text, lang="it")))
+
+        elif tag == STAGE:
+            stage_type = child.get("type")
+
+            # Stage directions (settings)
+            if stage_type == "setting":
+                setting_text = node_text(child)
+                if setting_text:
+                    g.add((scene_uri, dcterms.abstract, Literal(setting_text, lang="it")))
+
+                where_ref = child.get("where")
+                if where_ref:
+                    place_ref = where_ref.replace("#", "")
+                    place_uri = URIRef(base + f"place_{place_ref}")
+                    g.add((scene_uri, schema.location, place_uri))
+
+            # Transitions
+            elif stage_type == "transition":
+                transition_text = node_text(child)
+                if transition_text:
+                    g.add((scene_uri, schema.description, Literal(transition_text, lang="it")))
+
+        # Paragraphs
+        elif tag == P:
+            para_counter += 1
+            para_text = node_text(child)
+            if para_text:
+                para_uri = URIRef(base + f"{scene_id}_para_{para_counter}")
+                g.add((para_uri, RDF.type, schema.Text))
+                g.add((para_uri, schema.isPartOf, scene_uri))
+                g.add((para_uri, schema.text, Literal(para_text, lang="it")))
+                g.add((para_uri, schema.position, Literal(para_counter, datatype=XSD.integer)))
+
+        # Speeches
+        elif tag == SP:
+            speech_counter += 1
+            speech_to_rdf(g, scene_uri, scene_id, child, speech_counter, base)
+
+    return g
+
+
+def speech_to_rdf(g, scene_uri, scene_id, sp, speech_counter, base=rrr):
+    speaker_ref = sp.get("who")
+
+    speech_uri = URIRef(base + f"{scene_id}_speech_{speech_counter}")
+    g.add((speech_uri, RDF.type, schema.Text))
+    g.add((speech_uri, schema.isPartOf, scene_uri))
+    g.add((speech_uri, schema.position, Literal(speech_counter, datatype=XSD.integer)))
+
+    if speaker_ref:
+        character_id = speaker_ref.replace("#", "")
+        character_uri = URIRef(base + f"character_{character_id}")
+        g.add((speech_uri, schema.character, character_uri))
+
+    # Speaker (the first one) and dialogue paragraphs, in one pass
+    speaker_seen = False
+    for child in sp:
+        if child.tag == SPEAKER and not speaker_seen:
+            speaker_seen = True
+            if child.text:
+                g.add((speech_uri, schema.name, Literal(child.text, lang="it")))
+        elif child.tag == P:
+            dialog_text = node_text(child)
             if dialog_text:
                 g.add((speech_uri, schema.text, Literal(dialog_text, lang="it")))
 
-        for stage in sp.findall(".//tei:stage[@type='direction']", tei_ns):
-            direction_text = "".join(stage.itertext()).strip()
-            if direction_text:
-                g.add((speech_uri, schema.description, Literal(direction_text, lang="it")))
-
-    # Transitions
-    for stage in div.findall("tei:stage[@type='transition']", tei_ns):
-        transition_text = "".join(stage.itertext()).strip()
-        if transition_text:
-            g.add((scene_uri, schema.description, Literal(transition_text, lang="it")))
-
-# SERIALIZATION
-g.serialize(format="turtle", destination="../../tei_xslt/lastrada_screenplay.ttl")
-g.serialize(format="xml", destination="../../tei_xslt/lastrada_screenplay.rdf")
-
-print("XML converted to RDF!")
+    # Stage directions may be nested anywhere in the speech
+    for stage in speech_directions(sp):
+        direction_text = node_text(stage)
+        if direction_text:
+            g.add((speech_uri, schema.description, Literal(direction_text, lang="it")))
+
+    return g
+
+
+def convert(xml_file=XML_FILE, g=None):
+    if g is None:
+        g = new_graph()
+
+    # LOAD XML
+    tree = etree.parse(str(xml_file))
+    root = tree.getroot()
+
+    # MAIN ENTITY
+    doc_id = document_id(root, xml_file)
+    screenplay = screenplay_uri(doc_id)
+    base = document_base(doc_id)
+
+    header_to_rdf(g, screenplay, root)
+
+    # Persons, places and scenes in a single walk of the tree
+    scene_counter = 0
+    for elem in root.iter(PERSON, PLACE, DIV):
+        if elem.tag == PERSON:
+            person_to_rdf(g, screenplay, elem, base)
+        elif elem.tag == PLACE:
+            place_to_rdf(g, elem, base)
+        elif elem.get("type") == "scene":
+            scene_counter += 1
+            scene_to_rdf(g, screenplay, elem, scene_counter, base)
+
+    return g
+
+
+# STREAMING MODE
+# Reads the TEI file with iterparse and yields a small graph for every unit as
+# soon as its element closes: the teiHeader metadata, each person and place,
+# and each scene. Converted elements are cleared and detached from their
+# parent, so memory stays flat whatever the length of the screenplay.
+def iter_graphs(xml_file=XML_FILE):
+    screenplay = base = None
+    stack = []
+    scene_counter = 0
+    scene_numbers = []
+
+    for event, elem in etree.iterparse(str(xml_file), events=("start", "end")):
+        if event == "start":
+            if not stack and elem.tag != TEI:
+                raise ValueError(f"Not a TEI document: {xml_file}")
+            stack.append(elem)
+            # Scenes are numbered in document order, as in the tree mode
+            if elem.tag == DIV and elem.get("type") == "scene":
+                scene_counter += 1
+                scene_numbers.append(scene_counter)
+            continue
+
+        stack.pop()
+        tag = elem.tag
+        is_scene = tag == DIV and elem.get("type") == "scene"
+        # The document URI is known once the fileDesc has been read
+        if tag == FILE_DESC and stack:
+            doc_id = document_id(stack[0], xml_file)
+            screenplay, base = screenplay_uri(doc_id), document_base(doc_id)
+            continue
+        if screenplay is None and (tag in (TEI_HEADER, PERSON, PLACE) or is_scene):
+            doc_id = document_id(stack[0] if stack else elem, xml_file)
+            screenplay, base = screenplay_uri(doc_id), document_base(doc_id)
+
+        g = Graph()
+        if tag == TEI_HEADER:
+            header_to_rdf(g, screenplay, elem)
+        elif tag == PERSON:
+            person_to_rdf(g, screenplay, elem, base)
+        elif tag == PLACE:
+            place_to_rdf(g, elem, base)
+        elif is_scene:
+            scene_to_rdf(g, screenplay, elem, scene_numbers.pop(), base)
+        else:
+            continue
+
+        yield g
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+
+def convert_stream(xml_file=XML_FILE, g=None):
+    if g is None:
+        g = new_graph()
+    for part in iter_graphs(xml_file):
+        g.addN(triple + (g,) for triple in part)
+    return g
+
+
+# CORPUS MODE
+# Many TEI documents in one run: each file is converted (streaming) in a worker
+# process and written as one named graph of a combined N-Quads file
+CORPUS_FILE = tei_dir / "corpus.nq"
+
+
+def collect_tei_files(paths):
+    files = []
+    for path in paths:
+        if Path(path).is_dir():
+            files.extend(sorted(Path(path).glob("*.xml")))
+        else:
+            files.extend(sorted(Path(f) for f in glob.glob(str(path))))
+    return files
+
+
+# First end of fileDesc is enough to know the document id
+def read_document_id(xml_file):
+    root = None
+    for event, elem in etree.iterparse(str(xml_file), events=("start", "end")):
+        if root is None:
+            root = elem
+        if event == "end" and elem.tag == FILE_DESC:
+            break
+    return document_id(root, xml_file)
+
+
+# Worker: one document → (document id, N-Quads bytes in its own named graph)
+def convert_document(xml_file):
+    doc_id = read_document_id(xml_file)
+    g = convert_stream(xml_file, Graph())
+    return doc_id, rdf_output.graph_lines(g, "nquads", rrr["graph/" + doc_id])
+
+
+def convert_corpus(paths, destination=CORPUS_FILE, jobs=1):
+    files = collect_tei_files(paths)
+    jobs = jobs or os.cpu_count() or 1
+    documents = []
+    with rdf_output.open_output(destination) as out:
+        if jobs > 1 and len(files) > 1:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as pool:
+                for doc_id, data in pool.map(convert_document, files):
+                    out.write(data)
+                    documents.append(doc_id)
+        else:
+            for xml_file in files:
+                doc_id, data = convert_document(xml_file)
+                out.write(data)
+                documents.append(doc_id)
+
+    duplicates = sorted(d for d, n in Counter(documents).items() if n > 1)
+    if duplicates:
+        print(f"Warning: documents sharing an id (merged in one graph): {', '.join(duplicates)}")
+    return documents
+
+
+def main(fmt="turtle", compress=False, stream=False):
+    graph_id = rrr["graph/lastrada_screenplay"]
+
+    # Streamed line-based output: each scene is written as soon as it is read
+    if stream and fmt != "turtle":
+        with rdf_output.open_output(rdf_output.output_file(TTL_FILE, fmt, compress)) as out:
+            for part in iter_graphs():
+                out.write(rdf_output.graph_lines(part, fmt, graph_id))
+        print("XML converted to RDF!")
+        return
+
+    g = convert_stream() if stream else convert()
+
+    # SERIALIZATION
+    if fmt == "turtle":
+        g.serialize(format="turtle", destination=str(TTL_FILE))
+        # The RDF/XML serializer writes subjects in store order, which follows
+        # the hash seed: copy the triples, sorted, into an ordered store
+        ordered = Graph(store="SimpleMemory")
+        ordered.namespace_manager = g.namespace_manager
+        for triple in sorted(g):
+            ordered.add(triple)
+        ordered.serialize(format="xml", destination=str(RDF_FILE))
+    else:
+        rdf_output.write_graph(g, TTL_FILE, fmt, compress, graph_id)
+
+    print("XML converted to RDF!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert the TEI screenplay to RDF.")
+    parser.add_argument("--stream", action="store_true",
+                        help="read the TEI file with iterparse, one scene at a time")
+    parser.add_argument("--corpus", nargs="+", metavar="PATH",
+                        help="convert TEI files (folders or glob patterns) into one N-Quads file")
+    parser.add_argument("--output", default=str(CORPUS_FILE),
+                        help=f"with --corpus, the N-Quads file to write (default: tei_xslt/{CORPUS_FILE.name})")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="with --corpus, number of worker processes (0: one per CPU)")
+    args = rdf_output.add_format_arguments(parser).parse_args()
+
+    if args.corpus:
+        destination = rdf_output.output_file(args.output, "nquads", args.gzip)
+        documents = convert_corpus(args.corpus, destination, args.jobs)
+        print(f"{len(documents)} TEI documents converted into {destination}")
+    else:
+        main(args.format, args.gzip, args.stream)
@@ -6,6 +6,13 @@
 
   <xsl:output method="html" encoding="UTF-8" indent="yes"/>
 
+  <!-- Paginated edition (set by xml_to_html.py): page is '' for the single-page
+       edition, 'index' for the scene index, 'scene' for a one-scene document;
+       prev and next are the file names of the neighbouring scene pages -->
+  <xsl:param name="page" select="''"/>
+  <xsl:param name="prev" select="''"/>
+  <xsl:param name="next" select="''"/>
+
   <!-- ROOT TEMPLATE -->
   <xsl:template match="/">
     <xsl:text disable-output-escaping="yes">&lt;!DOCTYPE html&gt;</xsl:text>
@@ -107,6 +114,19 @@
             color: #999;
           }
         </style>
+        <xsl:if test="$page != ''">
+          <style>
+            nav.pager {
+              display: flex;
+              justify-content: space-between;
+              margin: 1rem 0;
+              font-size: 0.9rem;
+            }
+            ol.scene-index li {
+              margin-bottom: 0.35rem;
+            }
+          </style>
+        </xsl:if>
       </head>
       <body>
         <main>
@@ -123,11 +143,28 @@
             </p>
           </header>
 
-          <!-- Participants (cast & places) -->
-          <xsl:apply-templates select="/tei:TEI/tei:teiHeader/tei:profileDesc/tei:particDesc"/>
+          <xsl:choose>
+            <!-- Index page of the paginated edition -->
+            <xsl:when test="$page = 'index'">
+              <xsl:apply-templates select="/tei:TEI/tei:teiHeader/tei:profileDesc/tei:particDesc"/>
+              <xsl:call-template name="scene-index"/>
+            </xsl:when>
+
+            <!-- One scene of the paginated edition -->
+            <xsl:when test="$page = 'scene'">
+              <xsl:call-template name="pager"/>
+              <xsl:apply-templates select="/tei:TEI/tei:text"/>
+              <xsl:call-template name="pager"/>
+            </xsl:when>
+
+            <xsl:otherwise>
+              <!-- Participants (cast & places) -->
+              <xsl:apply-templates select="/tei:TEI/tei:teiHeader/tei:profileDesc/tei:particDesc"/>
 
-          <!-- Main text -->
-          <xsl:apply-templates select="/tei:TEI/tei:text"/>
+              <!-- Main text -->
+              <xsl:apply-templates select="/tei:TEI/tei:text"/>
+            </xsl:otherwise>
+          </xsl:choose>
         </main>
       </body>
     </html>
@@ -176,6 +213,70 @@
     </ul>
   </xsl:template>
 
+  <!-- PAGINATED EDITION -->
+
+  <!-- Scene page file name: xml:id of the scene, or its position -->
+  <xsl:template name="page-name">
+    <xsl:param name="position"/>
+    <xsl:choose>
+      <xsl:when test="@xml:id">
+        <xsl:value-of select="concat(@xml:id, '.html')"/>
+      </xsl:when>
+      <xsl:otherwise>
+        <xsl:value-of select="concat('scene-', $position, '.html')"/>
+      </xsl:otherwise>
+    </xsl:choose>
+  </xsl:template>
+
+  <xsl:template name="scene-index">
+    <section class="meta">
+      <h2>Scene</h2>
+      <ol class="scene-index">
+        <xsl:for-each select="/tei:TEI/tei:text//tei:div[@type='scene']">
+          <li>
+            <a>
+              <xsl:attribute name="href">
+                <xsl:call-template name="page-name">
+                  <xsl:with-param name="position" select="position()"/>
+                </xsl:call-template>
+              </xsl:attribute>
+              <xsl:choose>
+                <xsl:when test="tei:head[not(@type='logline')]">
+                  <xsl:value-of select="normalize-space(tei:head[not(@type='logline')][1])"/>
+                </xsl:when>
+                <xsl:otherwise>
+                  <xsl:value-of select="concat('Scena ', position())"/>
+                </xsl:otherwise>
+              </xsl:choose>
+            </a>
+            <xsl:if test="tei:head[@type='logline']">
+              <span class="logline">
+                <xsl:text> — </xsl:text>
+                <xsl:value-of select="normalize-space(tei:head[@type='logline'][1])"/>
+              </span>
+            </xsl:if>
+          </li>
+        </xsl:for-each>
+      </ol>
+    </section>
+  </xsl:template>
+
+  <xsl:template name="pager">
+    <nav class="pager">
+      <span>
+        <xsl:if test="$prev != ''">
+          <a href="{$prev}">&#8592; Scena precedente</a>
+        </xsl:if>
+      </span>
+      <a href="index.html">Indice</a>
+      <span>
+        <xsl:if test="$next != ''">
+          <a href="{$next}">Scena successiva &#8594;</a>
+        </xsl:if>
+      </span>
+    </nav>
+  </xsl:template>
+
   <!-- TEXT BODY -->
 
   <xsl:template match="tei:text">
@@ -0,0 +1,37 @@
+import pytest
+from rdflib import Literal, URIRef
+from rdflib.namespace import OWL, RDFS
+
+import merging
+from mapping import schema
+from merging import rrr
+
+HEADER = "subject,predicate,object,object_type,note\n"
+
+
+def write_edges(tmp_path, *rows):
+    path = tmp_path / "edges.csv"
+    path.write_text(HEADER + "".join(row + "\n" for row in rows), encoding="utf-8")
+    return path
+
+
+def test_edges_expand_curies_iris_and_local_names(tmp_path):
+    path = write_edges(
+        tmp_path,
+        "schema:VisualArtwork,rdfs:subClassOf,schema:CreativeWork,iri,",
+        "renzo_renzi,owl:sameAs,http://viaf.org/viaf/12345,iri,",
+        "renzo_renzi,rdfs:label,Renzo Renzi,literal,",
+    )
+    (batch,) = merging.iter_edge_batches(path)
+    assert batch == [
+        (schema.VisualArtwork, RDFS.subClassOf, schema.CreativeWork),
+        (rrr.renzo_renzi, OWL.sameAs, URIRef("http://viaf.org/viaf/12345")),
+        (rrr.renzo_renzi, RDFS.label, Literal("Renzo Renzi")),
+    ]
+
+
+def test_edges_reject_unknown_prefix(tmp_path):
+    path = write_edges(tmp_path, "schema:VisualArtwork,rdfs:subClassOf,schema:CreativeWork,iri,")
+    path.write_text(path.read_text(encoding="utf-8").replace("rdfs:", "rdfss:"), encoding="utf-8")
+    with pytest.raises(ValueError, match="rdfss"):
+        list(merging.iter_edge_batches(path))
@@ -0,0 +1,36 @@
+import pytest
+from rdflib import Graph
+
+import query
+import terms
+from query import TURTLE_FILE
+
+PREFIXES = """
+PREFIX dcterms: <http://purl.org/dc/terms/>
+PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+PREFIX owl: <http://www.w3.org/2002/07/owl#>
+"""
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    g = Graph()
+    terms.parse(g, str(TURTLE_FILE), format="turtle")
+    return g, query.Store.from_graph(g)
+
+
+@pytest.mark.parametrize("where", [
+    "?s dcterms:isPartOf ?o",
+    "?s dcterms:isPartOf/dcterms:hasPart ?o",
+    "?s ^dcterms:isPartOf ?o",
+    "?s dcterms:isPartOf+ ?o",
+    "?s owl:sameAs* ?o",
+    "?s dcterms:isPartOf|dcterms:hasPart ?o",
+    "?s rdf:type [] ; dcterms:isPartOf ?o",
+])
+def test_select_matches_rdflib(dataset, where):
+    g, store = dataset
+    sparql = f"{PREFIXES} SELECT ?s ?o WHERE {{ {where} }}"
+    expected = sorted(tuple(row) for row in g.query(sparql))
+    assert expected
+    assert sorted(store.query(sparql)) == expected
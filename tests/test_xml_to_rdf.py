@@ -0,0 +1,44 @@
+from rdflib import Dataset, Graph, URIRef
+from rdflib.namespace import RDF
+
+import xml_to_rdf
+from xml_to_rdf import rrr, schema
+
+
+def copy_document(tmp_path, doc_id):
+    # The project screenplay under another document id: same scene, person
+    # and place xml:ids
+    text = xml_to_rdf.XML_FILE.read_text(encoding="utf-8")
+    path = tmp_path / f"{doc_id}.xml"
+    path.write_text(text.replace('xml:id="lastrada_screenplay_seq1"', f'xml:id="{doc_id}"', 1), encoding="utf-8")
+    return path
+
+
+def test_project_screenplay_keeps_unscoped_iris():
+    g = xml_to_rdf.convert()
+    assert (rrr.scene_seq1, schema.isPartOf, rrr.lastrada_screenplay_seq1) in g
+
+
+def test_corpus_documents_sharing_ids_do_not_collide(tmp_path):
+    files = [copy_document(tmp_path, "draft_a"), copy_document(tmp_path, "draft_b")]
+    destination = tmp_path / "corpus.nq"
+    assert xml_to_rdf.convert_corpus(files, destination) == ["draft_a", "draft_b"]
+
+    ds = Dataset(default_union=True)
+    ds.parse(str(destination), format="nquads")
+    single = xml_to_rdf.convert_stream(files[0], Graph())
+    union = set(ds.triples((None, None, None)))
+    assert len(union) == 2 * len(single)
+
+    for doc_id in ("draft_a", "draft_b"):
+        scene = URIRef(f"{rrr}{doc_id}/scene_seq1")
+        assert set(ds.objects(scene, schema.isPartOf)) == {rrr[doc_id]}
+        assert (URIRef(f"{rrr}{doc_id}/character_gelsomina"), RDF.type, None) in ds
+    assert (rrr.scene_seq1, None, None) not in ds
+
+
+def test_stream_and_tree_modes_agree_on_scoped_iris(tmp_path):
+    path = copy_document(tmp_path, "draft_a")
+    tree = xml_to_rdf.convert(path, Graph())
+    stream = xml_to_rdf.convert_stream(path, Graph())
+    assert set(tree) == set(stream)